@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""软件目录规模对扫描耗时的影响
+
+在临时目录中生成一棵目录树，每TOOL_DIR_EVERY个叶子目录中放一个软件的可执行文件，
+PATH指向这些叶子目录。分别只用最初的4个软件和完整的软件目录进行全盘遍历与PATH索引，
+比较两者的耗时。文件名匹配是一次集合查找，耗时不应随软件数量成比例增长。
+扫描器的状态文件（慢目录隔离表等）在运行期间写入临时目录，不影响真实的缓存。
+
+用法: python benchmarks/bench_tool_catalogue.py [目录数] [每个目录的文件数]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import inventory_db, scanner
+from modules.tools import TOOL_SPECS
+from modules.walker import parallel_walk
+
+
+# 每隔多少个叶子目录放一个软件的可执行文件
+TOOL_DIR_EVERY = 10
+
+# 运行期间重定向到临时目录的扫描器状态文件
+STATE_FILES = [
+    'CACHE_FILE', 'FULL_SCAN_LOCK_FILE', 'DIR_INDEX_FILE', 'SCAN_CHECKPOINT_FILE',
+    'QUARANTINE_FILE', 'DIR_STATS_FILE',
+]
+
+
+def build_tree(base, dir_count, file_count):
+    """生成测试目录树
+
+    Returns:
+        list: 放有可执行文件的叶子目录（用作PATH）
+    """
+    exe_names = list(TOOL_SPECS)
+    suffix = '.exe' if os.name == 'nt' else ''
+    tool_dirs = []
+    for dir_index in range(dir_count):
+        directory = os.path.join(base, f"d{dir_index // 100}", f"d{dir_index}")
+        os.makedirs(directory, exist_ok=True)
+        for file_index in range(file_count):
+            open(os.path.join(directory, f"f{file_index}.txt"), 'w').close()
+        if dir_index % TOOL_DIR_EVERY == 0:
+            exe_name = exe_names[(dir_index // TOOL_DIR_EVERY) % len(exe_names)]
+            exe_path = os.path.join(directory, f"{exe_name}{suffix}")
+            open(exe_path, 'w').close()
+            os.chmod(exe_path, 0o755)
+            tool_dirs.append(directory)
+    return tool_dirs
+
+
+def redirect_state(state_dir):
+    """将扫描器的状态文件重定向到state_dir
+
+    Returns:
+        dict: 原来的设置，用于restore_state()
+    """
+    original = {name: getattr(scanner, name) for name in STATE_FILES}
+    for name, path in original.items():
+        setattr(scanner, name, os.path.join(state_dir, os.path.basename(path)))
+    original['INVENTORY_DB_FILE'] = inventory_db.INVENTORY_DB_FILE
+    inventory_db.INVENTORY_DB_FILE = os.path.join(state_dir, os.path.basename(inventory_db.INVENTORY_DB_FILE))
+    return original
+
+
+def restore_state(original):
+    """恢复redirect_state()修改的设置"""
+    inventory_db.INVENTORY_DB_FILE = original.pop('INVENTORY_DB_FILE')
+    for name, path in original.items():
+        setattr(scanner, name, path)
+
+
+def file_name_map(exe_names):
+    """生成文件名 -> 可执行文件名称映射"""
+    file_names = {}
+    for exe_name in exe_names:
+        file_names[exe_name] = exe_name
+        file_names[f"{exe_name}.exe"] = exe_name
+    return file_names
+
+
+def timed(func, repeat=5):
+    """返回多次运行中的最短耗时"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    dir_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    file_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    base = tempfile.mkdtemp(prefix="bench_tools_")
+    state_dir = tempfile.mkdtemp(prefix="bench_tools_state_")
+    original_state = redirect_state(state_dir)
+    try:
+        path_dirs = build_tree(base, dir_count, file_count)
+        path_env = os.pathsep.join(path_dirs)
+        original = dict(scanner.EXECUTABLES)
+
+        for label, exe_names in (
+            ("4个软件", ["python", "node", "java", "git"]),
+            (f"{len(TOOL_SPECS)}个软件", list(TOOL_SPECS)),
+        ):
+            file_names = file_name_map(exe_names)
+            walk_time = timed(lambda: list(parallel_walk([base], file_names)))
+
+            scanner.EXECUTABLES.clear()
+            scanner.EXECUTABLES.update({name: original[name] for name in exe_names})
+            index_time = timed(lambda: scanner.build_path_index(path_env))
+
+            print(f"{label}: 全盘遍历 {walk_time * 1000:.1f} ms, PATH索引 {index_time * 1000:.1f} ms")
+
+        scanner.EXECUTABLES.clear()
+        scanner.EXECUTABLES.update(original)
+    finally:
+        restore_state(original_state)
+        shutil.rmtree(base, ignore_errors=True)
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
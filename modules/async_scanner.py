@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""异步软件版本扫描模块
+
+基于asyncio.create_subprocess_exec实现，每个探测完成后立即产出
+(软件名称, 版本号, 安装路径) 记录，而不是在全部结束后一次性返回。
+文件读取、目录枚举和缓存读写（FileLock会轮询等待）都在线程池中执行，不阻塞事件循环。
+"""
+
+import asyncio
+import functools
+
+from modules.probe_process import run_probe_async
+from modules.scanner import (
+    EXECUTABLES,
+    DirDeadlines,
+    PROBE_FAILED,
+    PROBE_OK,
+    PROBE_TIMEOUT,
+    PROBE_MAX_WORKERS,
+    full_scan,
+    get_cache_candidates,
+    get_file_id,
+    get_install_dir_candidates,
+    get_path_candidates,
+    get_probe_command,
+    get_removed_paths,
+    inspect_executable,
+    load_cache,
+    lookup_cache,
+    make_entry,
+    merge_cache,
+    parse_version_output,
+    stat_candidate,
+    stat_fingerprint,
+    update_quarantine,
+)
+
+
+# 队列结束标记
+_DONE = object()
+
+
+async def run_version_probe_async(exe_name, exe_path, semaphore=None):
+    """异步运行可执行文件获取版本信息
+
+    探测进程有截止时间和资源上限，超时后结束整个进程树。
+
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+        semaphore (asyncio.Semaphore): 并发限制，为None时不限制
+
+    Returns:
+        tuple: (版本号或None, 探测状态)
+    """
+    semaphore = semaphore or asyncio.Semaphore(1)
+    async with semaphore:
+        try:
+            returncode, stdout, stderr, timed_out = await run_probe_async(
+                get_probe_command(exe_name, exe_path)
+            )
+        except asyncio.CancelledError:
+            raise
+        except:
+            return None, PROBE_FAILED
+
+    if timed_out:
+        return None, PROBE_TIMEOUT
+    if returncode == 0:
+        version = parse_version_output(exe_name, stdout, stderr)
+        if version:
+            return version, PROBE_OK
+    return None, PROBE_FAILED
+
+
+async def probe_executable_async(exe_name, exe_path, semaphore=None):
+    """异步获取可执行文件的版本号和架构
+
+    inspect_executable()在线程池中执行，无法得出结果时才启动子进程。
+
+    Returns:
+        tuple: (版本号或None, 架构或None, 探测状态)
+    """
+    loop = asyncio.get_running_loop()
+    version, arch, status = await loop.run_in_executor(None, inspect_executable, exe_name, exe_path)
+    if status is not None:
+        return version, arch, status
+    version, status = await run_version_probe_async(exe_name, exe_path, semaphore)
+    return version, arch, status
+
+
+async def probe_version_async(exe_name, exe_path, semaphore=None):
+    """异步获取可执行文件版本信息
+
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+        semaphore (asyncio.Semaphore): 并发限制，为None时不限制
+
+    Returns:
+        str: 版本号或None
+    """
+    version, _, _ = await probe_executable_async(exe_name, exe_path, semaphore)
+    return version
+
+
+async def _iter_candidates(candidates):
+    """将普通候选序列包装为异步迭代器"""
+    for candidate in candidates:
+        yield candidate
+
+
+async def stream_probes(candidates, max_workers=None, cache=None):
+    """并发探测候选可执行文件，按完成顺序产出结果
+
+    指纹与缓存一致的候选直接产出缓存条目，不启动子进程。
+    同一物理文件的多个别名只探测一次，结果分发给所有别名。
+    stat在线程池中执行，每个目录的第一次stat带截止时间；
+    位于慢目录中的候选不再访问，产出缓存条目。
+
+    Args:
+        candidates: (可执行文件名称, 可执行文件路径) 的异步迭代器
+        max_workers (int): 最大并发数，默认为PROBE_MAX_WORKERS
+        cache (dict): 可执行文件路径 -> 缓存条目
+
+    Yields:
+        tuple: (可执行文件路径, 缓存条目)，包含探测失败的负缓存条目
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_workers or PROBE_MAX_WORKERS)
+    results = asyncio.Queue()
+    tasks = []
+    seen = set()
+    # 物理文件标识 -> 探测任务
+    probe_tasks = {}
+    # 物理文件标识 -> (版本号, 架构, 探测状态)，来自缓存命中的别名
+    resolved = {}
+    deadlines = await loop.run_in_executor(None, DirDeadlines)
+
+    async def emit(exe_name, exe_path, fingerprint, probe_task):
+        version, arch, status = await probe_task
+        await results.put((exe_path, make_entry(exe_name, fingerprint, version, arch, status)))
+
+    async def produce():
+        try:
+            async for exe_name, exe_path in candidates:
+                if exe_path in seen:
+                    continue
+                seen.add(exe_path)
+                try:
+                    stat_result = await loop.run_in_executor(None, stat_candidate, exe_path, deadlines)
+                except TimeoutError:
+                    # 慢目录中的候选沿用缓存条目
+                    if cache and exe_path in cache:
+                        await results.put((exe_path, cache[exe_path]))
+                    continue
+                except OSError:
+                    continue
+                fingerprint = stat_fingerprint(stat_result)
+                file_id = get_file_id(exe_name, exe_path, stat_result)
+
+                entry = lookup_cache(cache, exe_name, exe_path, fingerprint)
+                if entry:
+                    resolved.setdefault(file_id, (entry['version'], entry.get('arch'), entry.get('status', PROBE_OK)))
+                    await results.put((exe_path, entry))
+                    continue
+                if file_id in resolved:
+                    await results.put((exe_path, make_entry(exe_name, fingerprint, *resolved[file_id])))
+                    continue
+
+                probe_task = probe_tasks.get(file_id)
+                if probe_task is None:
+                    probe_task = asyncio.ensure_future(probe_executable_async(exe_name, exe_path, semaphore))
+                    probe_tasks[file_id] = probe_task
+                    tasks.append(probe_task)
+                tasks.append(asyncio.ensure_future(emit(exe_name, exe_path, fingerprint, probe_task)))
+            await asyncio.gather(*tasks)
+        finally:
+            await loop.run_in_executor(None, update_quarantine, deadlines.timed_out)
+            await results.put(_DONE)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await results.get()
+            if item is _DONE:
+                break
+            yield item
+        # 传播生产者中的异常
+        await producer
+    finally:
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
+
+
+async def scan_software_versions_async(max_workers=None, full_disk=False):
+    """异步扫描系统中已安装的软件版本
+
+    与scan_software_versions()行为一致，按层发现：先PATH和缓存中已知的可执行文件，
+    再常见安装目录，full_disk为True时最后进行全盘扫描。
+    指纹未变化的条目直接产出缓存内容，其余探测完成后立即产出，每层结束后合并到缓存。
+
+    Args:
+        max_workers (int): 最大并发数，默认为PROBE_MAX_WORKERS
+        full_disk (bool): 是否进行全盘扫描
+
+    Yields:
+        tuple: (软件名称, 版本号, 安装路径)
+    """
+    loop = asyncio.get_running_loop()
+    cache = await loop.run_in_executor(None, load_cache)
+    candidates = await loop.run_in_executor(None, get_path_candidates)
+    candidates.extend(get_cache_candidates(cache))
+
+    # 第1层：PATH + 缓存中已知的可执行文件
+    entries = {}
+    async for path, entry in stream_probes(_iter_candidates(candidates), max_workers, cache):
+        entries[path] = entry
+        if entry['version']:
+            yield EXECUTABLES[entry['exe_name']], entry['version'], path
+
+    # 按条目合并到缓存，已删除的可执行文件从缓存中移除
+    await loop.run_in_executor(
+        None, functools.partial(merge_cache, entries, removed_paths=get_removed_paths(cache, entries))
+    )
+
+    # 第2层：常见安装目录
+    candidates = [
+        candidate for candidate in await loop.run_in_executor(None, get_install_dir_candidates)
+        if candidate[1] not in entries
+    ]
+    install_entries = {}
+    async for path, entry in stream_probes(_iter_candidates(candidates), max_workers, cache):
+        install_entries[path] = entry
+        if entry['version']:
+            yield EXECUTABLES[entry['exe_name']], entry['version'], path
+    await loop.run_in_executor(None, merge_cache, install_entries)
+
+    # 第3层：全盘扫描
+    if full_disk:
+        async for record in full_scan_async(max_workers):
+            yield record
+
+
+async def full_scan_async(max_workers=None, time_budget=None):
+    """异步全盘扫描软件
+
+    在线程池中执行full_scan()，与同步扫描共用单飞协调、扫描任务（暂停、取消和检查点）、
+    目录索引和贫瘠目录统计：时间预算用完后下次从检查点中的遍历前沿继续，
+    而不是每次都从根目录重新遍历同一段前缀。
+    新探测到的结果在探测完成时立即产出；复用缓存的条目，以及等待其他扫描时
+    得到的结果在扫描结束后产出。
+    调用方提前停止迭代时扫描在后台继续，结束后照常合并到缓存。
+
+    Args:
+        max_workers (int): 最大并发数，默认为PROBE_MAX_WORKERS
+        time_budget (float): 时间预算（秒），默认为FULL_SCAN_TIME_BUDGET
+
+    Yields:
+        tuple: (软件名称, 版本号, 安装路径)
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def on_entry(path, entry):
+        loop.call_soon_threadsafe(queue.put_nowait, (path, entry))
+
+    scan = loop.run_in_executor(None, full_scan, time_budget, on_entry, max_workers)
+    scan.add_done_callback(lambda _: queue.put_nowait(_DONE))
+
+    yielded = set()
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            break
+        path, entry = item
+        if entry['version']:
+            yielded.add(path)
+            yield EXECUTABLES[entry['exe_name']], entry['version'], path
+
+    for software, versions in (await scan).items():
+        for version, path in versions.items():
+            if path not in yielded:
+                yield software, version, path
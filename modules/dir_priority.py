@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""目录优先级模块
+
+全盘扫描按优先级遍历目录，最可能包含运行时的目录先遍历：
+目录名包含jdk、python、node、bin、tools等提示词的目录、上次扫描中找到过可执行文件的目录
+以及已知安装路径的上级目录优先，越深的目录越靠后。
+优先级按路径继承，提示目录下的整棵子树都会比同深度的其他目录先遍历。
+"""
+
+import os
+
+
+# 目录名提示词（小写，按子串匹配）
+NAME_HINTS = (
+    'jdk', 'jre', 'java', 'python', 'conda', 'node', 'nvm', 'npm', 'bin', 'tool',
+    'sdk', 'runtime', 'git', 'golang', 'versions', 'envs', 'programs', 'program files',
+)
+
+# 每深入一层增加的代价
+DEPTH_COST = 1
+# 目录名包含提示词时减少的代价
+NAME_HINT_BONUS = 3
+# 上次扫描中子树命中或已知安装路径的上级目录减少的代价
+HIT_BONUS = 5
+
+
+def get_hit_dirs(previous_index=None, known_paths=()):
+    """获取历史命中的目录
+
+    Args:
+        previous_index (dict): 上次全盘扫描保存的目录索引，子树命中标记为True的目录计入
+        known_paths (iterable): 已知的可执行文件路径，其所在目录及全部上级目录计入
+
+    Returns:
+        set: 目录路径集合
+    """
+    hit_dirs = {path for path, entry in (previous_index or {}).items() if entry[1]}
+    for path in known_paths:
+        directory = os.path.dirname(path)
+        while directory not in hit_dirs:
+            hit_dirs.add(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+    return hit_dirs
+
+
+def make_priority(hit_dirs=None):
+    """生成目录优先级函数
+
+    Args:
+        hit_dirs (set): get_hit_dirs()的返回值
+
+    Returns:
+        callable: 接收 (目录路径, 上级目录的优先级)，返回该目录的优先级，数值越小越先遍历
+    """
+    hit_dirs = hit_dirs or set()
+
+    def priority(path, parent_priority):
+        score = parent_priority + DEPTH_COST
+        name = os.path.basename(path).lower()
+        if any(hint in name for hint in NAME_HINTS):
+            score -= NAME_HINT_BONUS
+        if path in hit_dirs:
+            score -= HIT_BONUS
+        return score
+
+    return priority
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""全盘扫描目录规则模块
+
+包含两部分：
+1. 可配置的包含/排除规则，扩展固定的跳过目录列表。规则为fnmatch通配符，
+   不含路径分隔符的规则匹配目录名，含路径分隔符的规则匹配完整路径；包含规则优先。
+2. 学习得到的贫瘠目录统计：每次完整的全盘扫描结束后，记录子树中没有找到任何可执行文件的
+   大子树（如node_modules、照片库、site-packages）连续贫瘠的次数，
+   连续BARREN_SKIP_AFTER次贫瘠的子树在之后的扫描中跳过，每BARREN_REVISIT_EVERY次扫描重新遍历一次。
+"""
+
+import fnmatch
+import os
+
+
+# 默认排除规则：不会包含运行时的大目录
+DEFAULT_EXCLUDE_RULES = [
+    'node_modules', 'site-packages', 'dist-packages', '__pycache__',
+    '.git', '.svn', '.hg', '.tox', '.mypy_cache', '.pytest_cache',
+    '*.photoslibrary', '*.musiclibrary', 'System Volume Information',
+]
+
+# 子树连续贫瘠多少次后跳过
+BARREN_SKIP_AFTER = 3
+# 每隔多少次全盘扫描重新遍历一次已跳过的贫瘠子树
+BARREN_REVISIT_EVERY = 10
+# 只统计至少包含这么多目录的子树，小子树遍历开销很小
+BARREN_MIN_DIRS = 50
+
+
+def _has_separator(pattern):
+    return '/' in pattern or '\\' in pattern
+
+
+def match_rules(rules, path, name):
+    """检查目录是否匹配任一规则
+
+    Args:
+        rules (list): fnmatch通配符列表
+        path (str): 目录路径
+        name (str): 目录名
+
+    Returns:
+        bool: 匹配时返回True
+    """
+    for rule in rules:
+        if fnmatch.fnmatch(path if _has_separator(rule) else name, rule):
+            return True
+    return False
+
+
+def is_barren_skipped(stats, path):
+    """检查子树是否因连续贫瘠而在本次扫描中跳过
+
+    Args:
+        stats (dict): 贫瘠目录统计：{scans: 已完成的全盘扫描次数, dirs: 目录 -> [连续贫瘠次数, 子树目录数]}
+        path (str): 目录路径
+
+    Returns:
+        bool: 跳过时返回True
+    """
+    record = stats.get('dirs', {}).get(path)
+    if not record or record[0] < BARREN_SKIP_AFTER:
+        return False
+    # 定期重新遍历，子树中新安装的软件不会被永久忽略
+    return (stats.get('scans', 0) + 1) % BARREN_REVISIT_EVERY != 0
+
+
+def update_barren_stats(stats, index, partial=False):
+    """根据一次完整的全盘扫描更新贫瘠目录统计
+
+    只记录最大的贫瘠子树：子树没有命中，而上级目录有命中或是遍历的起始目录。
+    本次跳过的子树不在索引中，统计保持不变。
+
+    Args:
+        stats (dict): 贫瘠目录统计，原地更新
+        index (dict): 本次遍历的目录索引（子树命中标记已计算）
+        partial (bool): 索引只覆盖部分磁盘（从检查点继续的遍历、有目录超时被放弃），
+            索引以外的统计全部保留
+
+    Returns:
+        dict: 更新后的统计
+    """
+    # 每个目录的子树目录数，子目录路径总是比父目录长，按长度从长到短累加
+    sizes = {}
+    for path in sorted(index, key=len, reverse=True):
+        sizes[path] = sizes.get(path, 0) + 1
+        parent = os.path.dirname(path)
+        if parent != path and parent in index:
+            sizes[parent] = sizes.get(parent, 0) + sizes[path]
+
+    previous = stats.get('dirs', {})
+    barren = {}
+    for path, entry in index.items():
+        if entry[1]:
+            continue
+        parent = os.path.dirname(path)
+        if parent == path or parent not in index:
+            # 起始目录本身不跳过
+            continue
+        grandparent = os.path.dirname(parent)
+        parent_is_root = grandparent == parent or grandparent not in index
+        if not (index[parent][1] or parent_is_root):
+            continue
+        if sizes[path] < BARREN_MIN_DIRS:
+            continue
+        barren[path] = [previous.get(path, [0])[0] + 1, sizes[path]]
+
+    # 本次因贫瘠而跳过的子树不在索引中，保留原有统计；已删除或已排除的目录不再保留
+    for path, record in previous.items():
+        if path not in index and (partial or record[0] >= BARREN_SKIP_AFTER):
+            barren[path] = record
+
+    stats['scans'] = stats.get('scans', 0) + 1
+    stats['dirs'] = barren
+    return stats
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""可执行文件头解析模块
+
+只读取文件头和资源节中的少量字节，不执行文件：
+- PE（Windows）：COFF头中的机器类型，以及VERSIONINFO资源中的产品版本
+- ELF（Linux）：e_machine字段中的机器类型
+- Mach-O（macOS）：cputype字段中的机器类型，通用二进制取本机可以运行的架构
+- 脚本：#!行中的解释器路径
+
+preflight_check()根据文件头在启动探测子进程前排除明显无法运行的文件。
+"""
+
+import os
+import platform
+import re
+import struct
+import sys
+
+
+# PE COFF头机器类型
+PE_MACHINES = {
+    0x014c: "x86",
+    0x8664: "x64",
+    0xaa64: "arm64",
+    0x01c4: "arm"
+}
+
+# ELF e_machine机器类型
+ELF_MACHINES = {
+    0x03: "x86",
+    0x3e: "x64",
+    0xb7: "arm64",
+    0x28: "arm",
+    0xf3: "riscv"
+}
+
+# Mach-O cputype机器类型
+MACHO_MACHINES = {
+    0x00000007: "x86",
+    0x01000007: "x64",
+    0x0000000c: "arm",
+    0x0100000c: "arm64"
+}
+
+# Mach-O魔数：32/64位（两种字节序）和通用二进制
+MACHO_MAGICS = {
+    b'\xfe\xed\xfa\xce': '>', b'\xce\xfa\xed\xfe': '<',
+    b'\xfe\xed\xfa\xcf': '>', b'\xcf\xfa\xed\xfe': '<',
+}
+MACHO_FAT_MAGIC = b'\xca\xfe\xba\xbe'
+# 通用二进制的架构数很少，Java类文件的同一位置是版本号（>=45）
+MACHO_FAT_MAX_ARCHS = 30
+
+# 资源类型RT_VERSION
+RT_VERSION = 16
+
+# VS_FIXEDFILEINFO签名
+VS_FFI_SIGNATURE = 0xFEEF04BD
+
+# 单次读取的最大字节数，防止损坏的文件导致大量读取
+MAX_READ_SIZE = 64 * 1024
+
+# platform.machine() -> 架构名称
+HOST_MACHINES = {
+    'x86_64': 'x64',
+    'amd64': 'x64',
+    'i386': 'x86',
+    'i686': 'x86',
+    'x86': 'x86',
+    'aarch64': 'arm64',
+    'arm64': 'arm64',
+    'armv7l': 'arm',
+    'riscv64': 'riscv'
+}
+
+# 本机架构 -> 可以运行的可执行文件架构
+# Windows on ARM可以模拟运行x86/x64程序
+COMPATIBLE_ARCHS = {
+    'x64': {'x64', 'x86'},
+    'x86': {'x86'},
+    'arm64': {'arm64', 'arm', 'x64', 'x86'} if os.name == 'nt' else {'arm64', 'arm'},
+    'arm': {'arm'},
+    'riscv': {'riscv'}
+}
+
+# 预检查不通过的原因
+REJECT_EMPTY = 'empty'
+REJECT_NOT_EXECUTABLE = 'not executable'
+REJECT_UNKNOWN_FORMAT = 'unknown format'
+REJECT_FOREIGN_FORMAT = 'foreign format'
+REJECT_FOREIGN_ARCH = 'foreign arch'
+REJECT_NO_INTERPRETER = 'missing interpreter'
+
+
+def _read_at(f, offset, size):
+    """从指定偏移读取数据"""
+    f.seek(offset)
+    return f.read(min(size, MAX_READ_SIZE))
+
+
+def _align4(offset):
+    """按4字节对齐"""
+    return (offset + 3) & ~3
+
+
+def _parse_elf(header):
+    """解析ELF文件头"""
+    if len(header) < 20:
+        return None
+    # EI_DATA: 1为小端，2为大端
+    byte_order = '<' if header[5] == 1 else '>'
+    machine = struct.unpack_from(f'{byte_order}H', header, 18)[0]
+    return {
+        'format': 'ELF',
+        'arch': ELF_MACHINES.get(machine),
+        'version': None,
+        'fixed_version': None
+    }
+
+
+def _parse_macho(header):
+    """解析Mach-O文件头，通用二进制取本机可以运行的第一个架构"""
+    if header[:4] == MACHO_FAT_MAGIC:
+        count = struct.unpack_from('>I', header, 4)[0]
+        if not 0 < count <= MACHO_FAT_MAX_ARCHS:
+            return None
+        # fat_arch: cputype(4) + cpusubtype(4) + offset(4) + size(4) + align(4)
+        archs = [
+            MACHO_MACHINES.get(struct.unpack_from('>I', header, 8 + index * 20)[0])
+            for index in range(min(count, (len(header) - 8) // 20))
+        ]
+        compatible = COMPATIBLE_ARCHS.get(get_host_arch(), set())
+        arch = next((arch for arch in archs if arch in compatible), archs[0] if archs else None)
+    else:
+        if len(header) < 8:
+            return None
+        machine = struct.unpack_from(f'{MACHO_MAGICS[header[:4]]}I', header, 4)[0]
+        arch = MACHO_MACHINES.get(machine)
+    return {
+        'format': 'Mach-O',
+        'arch': arch,
+        'version': None,
+        'fixed_version': None
+    }
+
+
+def _parse_shebang(header):
+    """解析脚本的#!行"""
+    line = header[2:].split(b'\n', 1)[0].strip()
+    interpreter = line.split(None, 1)[0].decode(errors='replace') if line else None
+    return {
+        'format': 'script',
+        'arch': None,
+        'version': None,
+        'fixed_version': None,
+        'interpreter': interpreter
+    }
+
+
+def _rva_to_offset(sections, rva):
+    """将相对虚拟地址转换为文件偏移"""
+    for virtual_address, virtual_size, raw_size, raw_offset in sections:
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return rva - virtual_address + raw_offset
+    return None
+
+
+def _first_resource_entry(f, rsrc_offset, directory_offset, resource_id=None):
+    """读取资源目录中的条目
+
+    Args:
+        resource_id (int): 要查找的资源ID，为None时取第一个条目
+
+    Returns:
+        tuple: (是否为子目录, 相对资源节起始的偏移)，未找到时返回None
+    """
+    data = _read_at(f, rsrc_offset + directory_offset, 16)
+    if len(data) < 16:
+        return None
+    named_count, id_count = struct.unpack_from('<HH', data, 12)
+    count = named_count + id_count
+    entries = _read_at(f, rsrc_offset + directory_offset + 16, count * 8)
+    for index in range(len(entries) // 8):
+        name, target = struct.unpack_from('<II', entries, index * 8)
+        if resource_id is not None and (name & 0x80000000 or name != resource_id):
+            continue
+        return bool(target & 0x80000000), target & 0x7FFFFFFF
+    return None
+
+
+def _parse_version_node(data, offset):
+    """解析VERSIONINFO中的一个节点
+
+    Returns:
+        tuple: (键名, 值起始偏移, 值字节数, 值类型, 子节点起始偏移, 节点结束偏移)
+    """
+    length, value_length, value_type = struct.unpack_from('<HHH', data, offset)
+    end = min(offset + length, len(data))
+    key_end = offset + 6
+    while key_end + 1 < end and data[key_end:key_end + 2] != b'\0\0':
+        key_end += 2
+    key = data[offset + 6:key_end].decode('utf-16-le', errors='replace')
+    value_offset = _align4(key_end + 2)
+    # 文本类型的值长度以WORD计
+    value_size = value_length * 2 if value_type == 1 else value_length
+    children_offset = _align4(value_offset + value_size)
+    return key, value_offset, value_size, value_type, children_offset, end
+
+
+def _parse_version_info(data):
+    """解析VS_VERSIONINFO资源
+
+    Returns:
+        tuple: (第一个StringTable中的字符串 -> 值, VS_FIXEDFILEINFO中的产品版本元组)
+    """
+    key, value_offset, value_size, _, children_offset, end = _parse_version_node(data, 0)
+    if key != 'VS_VERSION_INFO':
+        return {}, None
+
+    fixed_version = None
+    if value_size >= 52:
+        signature, _, ms, ls, product_ms, product_ls = struct.unpack_from('<6I', data, value_offset)
+        if signature == VS_FFI_SIGNATURE:
+            fixed_version = (product_ms >> 16, product_ms & 0xFFFF, product_ls >> 16, product_ls & 0xFFFF)
+
+    strings = {}
+    offset = children_offset
+    while offset + 6 <= end and not strings:
+        key, _, _, _, table_offset, child_end = _parse_version_node(data, offset)
+        if child_end <= offset:
+            break
+        if key == 'StringFileInfo':
+            # StringFileInfo -> StringTable -> String
+            while table_offset + 6 <= child_end and not strings:
+                _, _, _, _, string_offset, table_end = _parse_version_node(data, table_offset)
+                if table_end <= table_offset:
+                    break
+                while string_offset + 6 <= table_end:
+                    name, value_start, size, _, _, string_end = _parse_version_node(data, string_offset)
+                    if string_end <= string_offset:
+                        break
+                    value = data[value_start:value_start + size].decode('utf-16-le', errors='replace')
+                    value = value.split('\0', 1)[0].strip()
+                    if value:
+                        strings[name] = value
+                    string_offset = _align4(string_end)
+                table_offset = _align4(table_end)
+        offset = _align4(child_end)
+
+    return strings, fixed_version
+
+
+def _parse_pe(f, header):
+    """解析PE文件头和VERSIONINFO资源"""
+    pe_offset = struct.unpack_from('<I', header, 0x3C)[0]
+    coff = _read_at(f, pe_offset, 24)
+    if len(coff) < 24 or coff[:4] != b'PE\0\0':
+        return None
+    machine, section_count = struct.unpack_from('<HH', coff, 4)
+    optional_size = struct.unpack_from('<H', coff, 20)[0]
+
+    result = {
+        'format': 'PE',
+        'arch': PE_MACHINES.get(machine),
+        'version': None,
+        'fixed_version': None,
+        'strings': {}
+    }
+
+    # 可选头中的资源目录（数据目录第3项）
+    optional = _read_at(f, pe_offset + 24, optional_size)
+    if len(optional) < 2:
+        return result
+    magic = struct.unpack_from('<H', optional, 0)[0]
+    directories_offset = 96 if magic == 0x10b else 112
+    if len(optional) < directories_offset + 3 * 8:
+        return result
+    resource_rva = struct.unpack_from('<I', optional, directories_offset + 2 * 8)[0]
+    if not resource_rva:
+        return result
+
+    # 节表
+    section_data = _read_at(f, pe_offset + 24 + optional_size, section_count * 40)
+    sections = []
+    for index in range(len(section_data) // 40):
+        virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from('<IIII', section_data, index * 40 + 8)
+        sections.append((virtual_address, virtual_size, raw_size, raw_offset))
+    rsrc_offset = _rva_to_offset(sections, resource_rva)
+    if rsrc_offset is None:
+        return result
+
+    # 资源目录：类型(RT_VERSION) -> 名称 -> 语言 -> 数据条目
+    entry = _first_resource_entry(f, rsrc_offset, 0, RT_VERSION)
+    for _ in range(2):
+        if not entry or not entry[0]:
+            return result
+        entry = _first_resource_entry(f, rsrc_offset, entry[1])
+    if not entry or entry[0]:
+        return result
+
+    data_entry = _read_at(f, rsrc_offset + entry[1], 16)
+    if len(data_entry) < 16:
+        return result
+    data_rva, data_size = struct.unpack_from('<II', data_entry, 0)
+    data_offset = _rva_to_offset(sections, data_rva)
+    if data_offset is None:
+        return result
+
+    version_data = _read_at(f, data_offset, data_size)
+    if len(version_data) >= 6:
+        result['strings'], result['fixed_version'] = _parse_version_info(version_data)
+        result['version'] = result['strings'].get('ProductVersion')
+    return result
+
+
+def read_exe_header(exe_path):
+    """读取可执行文件头信息
+
+    Args:
+        exe_path (str): 可执行文件路径
+
+    Returns:
+        dict: {format, arch, version, fixed_version}，PE文件另有strings（VERSIONINFO字符串），
+            脚本另有interpreter，无法识别时返回None
+    """
+    try:
+        with open(exe_path, 'rb') as f:
+            header = f.read(256)
+            if header[:4] == b'\x7fELF':
+                return _parse_elf(header)
+            if header[:2] == b'MZ' and len(header) >= 64:
+                return _parse_pe(f, header)
+            if header[:4] in MACHO_MAGICS or header[:4] == MACHO_FAT_MAGIC:
+                return _parse_macho(header)
+            if header[:2] == b'#!':
+                return _parse_shebang(header)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def get_host_arch():
+    """获取本机架构，无法识别时返回None"""
+    return HOST_MACHINES.get(platform.machine().lower())
+
+
+def preflight_check(exe_path, header, stat_result=None):
+    """启动探测子进程前检查文件是否可以运行
+
+    只使用文件头和stat结果：空文件、没有执行权限、格式不属于本平台、
+    架构与本机不兼容、脚本的解释器不存在时都无需启动子进程。
+    Windows下的.bat/.cmd等脚本没有文件头，只检查.exe。
+
+    Args:
+        exe_path (str): 可执行文件路径
+        header (dict): read_exe_header()的返回值
+        stat_result (os.stat_result): 可执行文件的stat结果，为None时重新获取
+
+    Returns:
+        str: 不通过的原因，通过时返回None
+    """
+    try:
+        stat_result = stat_result or os.stat(exe_path)
+    except OSError:
+        return REJECT_NOT_EXECUTABLE
+    if not stat_result.st_size:
+        return REJECT_EMPTY
+
+    file_format = header.get('format') if header else None
+    if os.name == 'nt':
+        if not exe_path.lower().endswith('.exe'):
+            return None
+        if file_format != 'PE':
+            return REJECT_FOREIGN_FORMAT if file_format else REJECT_UNKNOWN_FORMAT
+    else:
+        if not os.access(exe_path, os.X_OK):
+            return REJECT_NOT_EXECUTABLE
+        # 无法识别的格式交给探测子进程判断，不作为预检查失败写入负缓存
+        if file_format is None:
+            return None
+        native_format = 'Mach-O' if sys.platform == 'darwin' else 'ELF'
+        if file_format in ('PE', 'ELF', 'Mach-O') and file_format != native_format:
+            return REJECT_FOREIGN_FORMAT
+        if file_format == 'script':
+            interpreter = header.get('interpreter')
+            if not interpreter or not os.access(interpreter, os.X_OK):
+                return REJECT_NO_INTERPRETER
+            return None
+
+    host_arch = get_host_arch()
+    arch = header.get('arch')
+    if host_arch and arch and arch not in COMPATIBLE_ARCHS.get(host_arch, {host_arch}):
+        return REJECT_FOREIGN_ARCH
+    return None
+
+
+def header_matches_tool(header, exe_name, product_hints):
+    """检查PE文件的VERSIONINFO是否属于该软件本身
+
+    distlib启动器、Scoop/Chocolatey的shim和venv启动器同样命名为python.exe、git.exe等，
+    它们的ProductVersion是启动器自己的版本。OriginalFilename必须是该可执行文件名，
+    ProductName或CompanyName必须包含软件的提示词；没有这些字符串时同样不采信。
+
+    Args:
+        header (dict): read_exe_header()的返回值
+        exe_name (str): 可执行文件名称（不含扩展名）
+        product_hints (iterable): 小写的产品名称提示词
+
+    Returns:
+        bool: 匹配时返回True
+    """
+    strings = header.get('strings') if header else None
+    if not strings:
+        return False
+    # 缺少OriginalFilename的头同样不采信
+    original_filename = strings.get('OriginalFilename', '').lower()
+    if original_filename not in (exe_name, f"{exe_name}.exe"):
+        return False
+    product = f"{strings.get('ProductName', '')} {strings.get('CompanyName', '')}".lower()
+    return any(hint in product for hint in product_hints)
+
+
+def header_product_version(header):
+    """从PE文件的ProductVersion字符串读取版本号
+
+    python.exe/node.exe/git.exe的ProductVersion为 3.11.7、20.11.0、2.43.0.windows.1，
+    取前三段数字，与版本探测输出的格式一致。
+
+    Args:
+        header (dict): read_exe_header()的返回值
+
+    Returns:
+        str: 版本号或None
+    """
+    product_version = header.get('version') if header else None
+    if product_version:
+        match = re.match(r'v?(\d+\.\d+\.\d+)', product_version)
+        if match:
+            return match.group(1)
+    return None
+
+
+def header_java_version(header):
+    """从java.exe的固定版本信息读取Java版本
+
+    java.exe的产品版本为 8.0.2710.9（对应1.8.0_271）或 17.0.2.0（对应17.0.2）。
+
+    Args:
+        header (dict): read_exe_header()的返回值
+
+    Returns:
+        str: 版本号或None
+    """
+    fixed_version = header.get('fixed_version') if header else None
+    if not fixed_version or not fixed_version[0]:
+        return None
+    major, minor, build = fixed_version[:3]
+    if major <= 8:
+        return f"1.{major}.{minor}_{build // 10}"
+    return f"{major}.{minor}.{build}"
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""跨进程文件锁模块
+
+POSIX下使用fcntl.flock，Windows下使用msvcrt.locking锁定锁文件的第一个字节。
+两者都由操作系统在进程退出时自动释放，进程崩溃不会留下无法释放的锁。
+"""
+
+import os
+import time
+
+
+# 等待锁时的轮询间隔（秒）
+LOCK_POLL_INTERVAL = 0.1
+
+
+class FileLock:
+    """跨进程文件锁，支持with语句"""
+    def __init__(self, path):
+        # 锁文件路径
+        self.path = path
+        # 持有锁时打开的文件
+        self.file = None
+
+    def _try_lock(self):
+        """尝试加锁一次，成功返回True"""
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, blocking=True, timeout=None):
+        """加锁
+
+        Args:
+            blocking (bool): 锁被占用时是否等待
+            timeout (float): 最长等待时间（秒），为None时一直等待
+
+        Returns:
+            bool: 是否成功加锁
+        """
+        if self.file is not None:
+            return True
+        self.file = open(self.path, 'a+')
+        deadline = None if timeout is None else time.time() + timeout
+        while not self._try_lock():
+            if not blocking or (deadline is not None and time.time() >= deadline):
+                self.file.close()
+                self.file = None
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+        return True
+
+    def release(self):
+        """释放锁"""
+        if self.file is None:
+            return
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        finally:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -2,10 +2,34 @@
 """GUI界面模块"""
 
 import os
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
 from modules.env_manager import add_to_path
-from modules.scanner import scan_software_versions
+from modules.scanner import (
+    CACHE_EMPTY,
+    CACHE_MISSING,
+    CACHE_PARTIAL,
+    CACHE_STALE,
+    load_software_versions,
+    start_revalidate,
+)
+from modules.tools import get_nav_items
+
+
+# 检查后台刷新结果的间隔（毫秒）
+SCAN_POLL_INTERVAL = 200
+
+# 状态栏中显示的缓存状态，结果有效时不显示
+CACHE_STATE_TEXT = {
+    CACHE_MISSING: '尚未进行全盘扫描',
+    CACHE_STALE: '全盘扫描结果已过期',
+    CACHE_PARTIAL: '上次全盘扫描没有完成',
+    CACHE_EMPTY: '没有找到已安装的软件',
+}
+
+# 询问是否进行全盘扫描的缓存状态：全盘扫描只在明确要求时进行，结果过期只在状态栏中提示
+FULL_SCAN_PROMPT_STATES = (CACHE_MISSING, CACHE_PARTIAL)
 
 
 # 全局变量存储
@@ -20,12 +44,21 @@ class AppData:
         self.item_key_map = {}
         # 软件版本信息
         self.software_versions = {}
+        # 可执行文件路径 -> 架构，由后台刷新计算
+        self.archs = {}
         # 当前选中的导航项
         self.current_nav = None
         self.current_category = None
+        # 后台刷新线程发布的 (软件版本, 差异)，由主线程取出并更新表格
+        self.scan_updates = queue.Queue()
+        # 本次运行中是否已经询问过全盘扫描
+        self.full_scan_prompted = False
+        # 用户已同意、等待当前刷新结束后开始的全盘扫描
+        self.full_scan_pending = False
         # UI组件
         self.root = None
         self.tree = None
+        self.status_label = None
 
 
 # 全局应用数据实例
@@ -42,6 +75,7 @@ def init_parameters():
     app_data.item_key_map = {}
     # 软件版本信息
     app_data.software_versions = {}
+    app_data.archs = {}
     # 当前选中的导航项
     app_data.current_nav = tk.StringVar(value='All')
     app_data.current_category = tk.StringVar(value='All')
@@ -77,10 +111,8 @@ def init_ui(root):
     style.configure('Category.TLabel', font=('微软雅黑', 9, 'bold'), foreground='#999999', background='#ffffff')
     
     # 导航项
-    nav_items = {
-        'Languages': ['Python', 'Node.js', 'Java', 'Git'],
-        'All': ['All']
-    }
+    nav_items = get_nav_items()
+    nav_items['All'] = ['All']
     
     # 创建右侧内容区域
     content_frame = ttk.Frame(main_frame, style='Content.TFrame')
@@ -94,7 +126,7 @@ def init_ui(root):
     table_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
     
     # 表格列
-    columns = ('package', 'version', 'status')
+    columns = ('package', 'version', 'arch', 'status')
     
     # 创建树状表格
     tree = ttk.Treeview(
@@ -110,11 +142,13 @@ def init_ui(root):
     # 配置列
     tree.heading('package', text='程序')
     tree.heading('version', text='版本')
+    tree.heading('arch', text='架构')
     tree.heading('status', text='状态')
     
     # 配置列宽
     tree.column('package', width=350, anchor=tk.W)
     tree.column('version', width=100, anchor=tk.CENTER)
+    tree.column('arch', width=80, anchor=tk.CENTER)
     tree.column('status', width=100, anchor=tk.CENTER)
     
     # 添加滚动条
@@ -131,13 +165,8 @@ def init_ui(root):
     return main_frame, sidebar_frame, content_frame, tree, button_frame, nav_items, style
 
 
-def init_data(enabled_versions):
-    """初始化数据"""
-    enabled_versions.clear()
-    
-    # 扫描软件版本
-    software_versions = scan_software_versions()
-    
+def get_current_path():
+    """获取最新的PATH环境变量"""
     # 直接从注册表获取最新的PATH环境变量
     try:
         import winreg
@@ -149,27 +178,53 @@ def init_data(enabled_versions):
     except:
         # 如果从注册表读取失败，使用当前进程的环境变量
         current_path = os.environ.get('PATH', '')
+    return current_path
+
+
+def init_data():
+    """初始化数据
     
-    path_dirs = current_path.split(';')
+    立即显示上次扫描的结果。启用状态（需要列出PATH目录）和架构由后台刷新计算，
+    随差异一起由poll_scan_updates()应用到表格。
+    """
+    app_data.enabled_versions.clear()
+    app_data.archs = {}
     
-    # 对于每个软件，检查其路径是否在PATH的最前面
-    for software, versions in software_versions.items():
-        # 存储软件的所有可执行目录
-        software_dirs = {}
-        for version, path in versions.items():
-            # 获取可执行文件所在目录
-            exe_dir = path.rsplit('\\', 1)[0] if '\\' in path else path
-            software_dirs[exe_dir] = version
-        
-        # 遍历PATH目录，找到第一个匹配的软件目录
-        for dir_path in path_dirs:
-            dir_path = dir_path.strip()
-            if dir_path in software_dirs:
-                # 设置为启用
-                enabled_versions[software] = software_dirs[dir_path]
-                break
+    # 上次扫描的软件版本
+    app_data.software_versions = load_software_versions()
+
+
+def start_refresh(full_disk=False):
+    """在后台重新扫描，结果由poll_scan_updates()应用到表格
     
-    return software_versions
+    Args:
+        full_disk (bool): 是否进行全盘扫描
+    
+    Returns:
+        bool: 是否启动了新的刷新，已有刷新在进行时返回False
+    """
+    return start_revalidate(app_data.software_versions, on_scan_update, full_disk, get_current_path)
+
+
+def on_scan_update(software_versions, delta):
+    """后台刷新每完成一层发现时的回调（在扫描线程中调用）"""
+    app_data.scan_updates.put((software_versions, delta))
+
+
+def poll_scan_updates():
+    """在主线程中取出后台刷新结果并更新表格"""
+    try:
+        while True:
+            software_versions, delta = app_data.scan_updates.get_nowait()
+            apply_scan_delta(software_versions, delta)
+    except queue.Empty:
+        pass
+    except:
+        pass
+    # 已有刷新在进行时全盘扫描无法开始，等它结束后再开始
+    if app_data.full_scan_pending and start_refresh(full_disk=True):
+        app_data.full_scan_pending = False
+    app_data.root.after(SCAN_POLL_INTERVAL, poll_scan_updates)
 
 
 def on_nav_click(category, item):
@@ -179,16 +234,8 @@ def on_nav_click(category, item):
     update_table(item)
 
 
-def init_enabled_status():
-    """初始化启用状态"""
-    app_data.software_versions = init_data(app_data.enabled_versions)
-
-
 def update_table(filter_item):
-    """更新表格数据"""
-    # 初始化启用状态
-    init_enabled_status()
-    
+    """更新表格数据（只使用已有的数据，不访问文件系统）"""
     # 清空表格
     for item in app_data.tree.get_children():
         app_data.tree.delete(item)
@@ -197,33 +244,115 @@ def update_table(filter_item):
     app_data.version_paths.clear()
     app_data.item_key_map.clear()
     
-    # 填充数据
-    for software, versions in app_data.software_versions.items():
+    # 要显示的行
+    rows = [
+        (software, version, path)
+        for software, versions in app_data.software_versions.items()
         # 过滤
-        if filter_item != 'All' and software != filter_item:
-            continue
-        
-        for version, path in versions.items():
-            # 获取路径的目录部分
-            dir_path = path.rsplit('\\', 1)[0] if '\\' in path else path
-            # 合并软件名称和安装目录（同一行）
-            package_name = f"{software} ({dir_path})"
-            
-            # 检查是否已启用
-            status = '已启用' if app_data.enabled_versions.get(software) == version else '未启用'
-            
-            # 生成唯一键
+        if filter_item == 'All' or software == filter_item
+        for version, path in versions.items()
+    ]
+    
+    # 填充数据
+    for software, version, path in rows:
+        insert_row(software, version, path, app_data.archs)
+
+
+def get_row_values(software, version, path, archs):
+    """生成表格行的显示内容"""
+    # 获取路径的目录部分
+    dir_path = path.rsplit('\\', 1)[0] if '\\' in path else path
+    # 合并软件名称和安装目录（同一行）
+    package_name = f"{software} ({dir_path})"
+    
+    # 检查是否已启用
+    status = '已启用' if app_data.enabled_versions.get(software) == version else '未启用'
+    
+    return package_name, version, archs.get(path) or '-', status
+
+
+def insert_row(software, version, path, archs):
+    """向表格添加一行"""
+    # 生成唯一键
+    key = f"{software}_{version}"
+    app_data.version_paths[key] = (software, version, path)
+    
+    # 添加到表格
+    item_id = app_data.tree.insert('', tk.END, values=get_row_values(software, version, path, archs))
+    # 存储item_id到key的映射
+    app_data.item_key_map[item_id] = key
+
+
+def apply_scan_delta(software_versions, delta):
+    """将后台刷新得到的差异应用到表格，只增删改变化的行
+    
+    Args:
+        software_versions (dict): 刷新后的软件版本
+        delta (dict): diff_software_versions()的返回值，另有扫描线程中计算的
+            enabled（启用的版本）、archs（架构）和slow_dirs（慢目录）
+    """
+    app_data.software_versions = software_versions
+    app_data.enabled_versions.clear()
+    app_data.enabled_versions.update(delta.get('enabled', {}))
+    app_data.archs = delta.get('archs', {})
+    
+    filter_item = app_data.current_nav.get()
+    archs = app_data.archs
+    key_items = {key: item_id for item_id, key in app_data.item_key_map.items()}
+    
+    # 删除已不存在的版本
+    for software, versions in delta['removed'].items():
+        for version in versions:
             key = f"{software}_{version}"
-            app_data.version_paths[key] = (software, version, path)
-            
-            # 添加到表格
-            item_id = app_data.tree.insert('', tk.END, values=(
-                package_name, 
-                version, 
-                status
-            ))
-            # 存储item_id到key的映射
-            app_data.item_key_map[item_id] = key
+            item_id = key_items.pop(key, None)
+            if item_id:
+                app_data.tree.delete(item_id)
+                del app_data.item_key_map[item_id]
+            app_data.version_paths.pop(key, None)
+    
+    # 新增的版本和安装路径变化的版本
+    for change in ('added', 'changed'):
+        for software, versions in delta[change].items():
+            if filter_item != 'All' and software != filter_item:
+                continue
+            for version, path in versions.items():
+                key = f"{software}_{version}"
+                item_id = key_items.get(key)
+                if item_id:
+                    app_data.version_paths[key] = (software, version, path)
+                    app_data.tree.item(item_id, values=get_row_values(software, version, path, archs))
+                else:
+                    insert_row(software, version, path, archs)
+    
+    # 启用的版本可能随PATH变化，启动时显示的行还没有架构
+    for item_id, key in app_data.item_key_map.items():
+        software, version, path = app_data.version_paths[key]
+        app_data.tree.item(item_id, values=get_row_values(software, version, path, archs))
+    
+    show_status(delta.get('cache_state'), delta.get('slow_dirs', []))
+    if delta.get('full_scan_due') and delta.get('cache_state') in FULL_SCAN_PROMPT_STATES:
+        prompt_full_scan(delta['cache_state'])
+
+
+def show_status(cache_state, slow_dirs):
+    """在状态栏中显示缓存状态和因响应缓慢而跳过的目录"""
+    if not app_data.status_label:
+        return
+    parts = []
+    if cache_state in CACHE_STATE_TEXT:
+        parts.append(CACHE_STATE_TEXT[cache_state])
+    if slow_dirs:
+        parts.append(f"已跳过响应缓慢的目录: {'; '.join(slow_dirs)}")
+    app_data.status_label.config(text='；'.join(parts))
+
+
+def prompt_full_scan(cache_state):
+    """从未完成全盘扫描或上次全盘扫描中断时询问是否进行全盘扫描（每次运行只询问一次）"""
+    if app_data.full_scan_prompted:
+        return
+    app_data.full_scan_prompted = True
+    if messagebox.askyesno("全盘扫描", f"{CACHE_STATE_TEXT[cache_state]}，是否在后台进行全盘扫描？"):
+        app_data.full_scan_pending = True
 
 
 def activate_version(software, version, path):
@@ -275,7 +404,8 @@ def refresh_and_init(show_message=True):
         show_message (bool): 是否显示操作结果消息框
     """
     try:
-        # 更新表格（包含初始化启用状态，会调用init_enabled_status重新扫描版本）
+        # 后台重新扫描，版本和启用状态的变化由poll_scan_updates()应用到表格
+        start_refresh()
         update_table(app_data.current_nav.get())
         
         if show_message:
@@ -285,6 +415,13 @@ def refresh_and_init(show_message=True):
             messagebox.showerror("错误", f"刷新版本列表失败: {e}")
 
 
+def start_full_disk_scan():
+    """在后台进行全盘扫描，结果由poll_scan_updates()应用到表格"""
+    app_data.full_scan_prompted = True
+    if not start_refresh(full_disk=True):
+        messagebox.showinfo("提示", "正在扫描，请稍后再试")
+
+
 def enable_selected():
     """启用选中的版本"""
     selected_item = app_data.tree.selection()
@@ -345,6 +482,15 @@ def create_gui():
     )
     refresh_button.pack(side=tk.RIGHT, padx=5)
     
+    # 全盘扫描按钮
+    full_scan_button = ttk.Button(
+        button_frame, 
+        text="全盘扫描", 
+        style='Accent.TButton',
+        command=start_full_disk_scan
+    )
+    full_scan_button.pack(side=tk.RIGHT, padx=5)
+    
     # 启用按钮
     enable_button = ttk.Button(
         button_frame, 
@@ -354,8 +500,17 @@ def create_gui():
     )
     enable_button.pack(side=tk.RIGHT, padx=5)
     
-    # 初始化表格
+    # 状态栏
+    app_data.status_label = ttk.Label(button_frame, text='', foreground='#999999')
+    app_data.status_label.pack(side=tk.LEFT, padx=5)
+    
+    # 显示上次扫描的结果，并在后台刷新一次（切换导航时不再重新扫描）
+    init_data()
     update_table('All')
+    start_refresh()
+    
+    # 接收后台刷新结果
+    poll_scan_updates()
     
     # 启动主循环
     root.mainloop()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""常见安装目录模块
+
+列出安装程序和版本管理器（pyenv、nvm、sdkman、asdf、conda等）固定使用的目录，
+分层发现时在PATH之后、全盘扫描之前只列出这些目录，不做递归遍历。
+目录模式中可以使用 ~、环境变量和glob通配符，未设置的环境变量不会匹配任何目录。
+"""
+
+import glob
+import os
+
+
+# POSIX下的常见安装目录
+POSIX_INSTALL_DIR_PATTERNS = [
+    # pyenv
+    "$PYENV_ROOT/versions/*/bin",
+    "~/.pyenv/versions/*/bin",
+    # nvm / volta
+    "$NVM_DIR/versions/node/*/bin",
+    "~/.nvm/versions/node/*/bin",
+    "~/.volta/tools/image/node/*/bin",
+    # sdkman（java、maven、gradle等）
+    "$SDKMAN_DIR/candidates/*/*/bin",
+    "~/.sdkman/candidates/*/*/bin",
+    # asdf / mise
+    "$ASDF_DATA_DIR/installs/*/*/bin",
+    "~/.asdf/installs/*/*/bin",
+    "~/.local/share/mise/installs/*/*/bin",
+    # rbenv / rustup
+    "~/.rbenv/versions/*/bin",
+    "~/.cargo/bin",
+    "~/.rustup/toolchains/*/bin",
+    # IntelliJ下载的JDK
+    "~/.jdks/*/bin",
+    "~/.jdks/*/Contents/Home/bin",
+    # Gradle/Maven Wrapper下载的发行包
+    "~/.gradle/wrapper/dists/*/*/*/bin",
+    "~/.m2/wrapper/dists/*/*/*/bin",
+    # conda
+    "$CONDA_PREFIX/bin",
+    "~/miniconda3/bin",
+    "~/miniconda3/envs/*/bin",
+    "~/anaconda3/bin",
+    "~/anaconda3/envs/*/bin",
+    "~/miniforge3/bin",
+    "~/miniforge3/envs/*/bin",
+    "/opt/conda/bin",
+    "/opt/conda/envs/*/bin",
+    # 系统和Homebrew安装
+    "/usr/lib/jvm/*/bin",
+    "/usr/local/go/bin",
+    "/usr/local/opt/*/bin",
+    "/opt/homebrew/opt/*/bin",
+    "/Library/Java/JavaVirtualMachines/*/Contents/Home/bin",
+]
+
+# Windows下的常见安装目录
+WINDOWS_INSTALL_DIR_PATTERNS = [
+    # Java
+    "%ProgramFiles%\\Java\\*\\bin",
+    "%ProgramFiles(x86)%\\Java\\*\\bin",
+    "%ProgramFiles%\\Eclipse Adoptium\\*\\bin",
+    "%ProgramFiles%\\Microsoft\\jdk-*\\bin",
+    "%ProgramFiles%\\Zulu\\*\\bin",
+    "~\\.jdks\\*\\bin",
+    # Python
+    "%ProgramFiles%\\Python*",
+    "%LOCALAPPDATA%\\Programs\\Python\\Python*",
+    "~\\.pyenv\\pyenv-win\\versions\\*",
+    # Node.js
+    "%ProgramFiles%\\nodejs",
+    "%NVM_HOME%\\v*",
+    "%APPDATA%\\nvm\\v*",
+    # 其他软件
+    "%ProgramFiles%\\Git\\cmd",
+    "%ProgramFiles%\\Go\\bin",
+    "%ProgramFiles%\\dotnet",
+    "~\\.cargo\\bin",
+    "~\\scoop\\apps\\*\\current",
+    "~\\scoop\\apps\\*\\current\\bin",
+    "~\\.gradle\\wrapper\\dists\\*\\*\\*\\bin",
+    "~\\.m2\\wrapper\\dists\\*\\*\\*\\bin",
+    # conda（Windows下python.exe位于环境根目录）
+    "%CONDA_PREFIX%",
+    "~\\miniconda3",
+    "~\\miniconda3\\envs\\*",
+    "~\\anaconda3",
+    "~\\anaconda3\\envs\\*",
+    "%ProgramData%\\miniconda3",
+    "%ProgramData%\\miniconda3\\envs\\*",
+    "%ProgramData%\\Anaconda3",
+    "%ProgramData%\\Anaconda3\\envs\\*",
+]
+
+
+def get_install_dir_patterns():
+    """获取当前平台的常见安装目录模式"""
+    if os.name == 'nt':
+        return WINDOWS_INSTALL_DIR_PATTERNS
+    return POSIX_INSTALL_DIR_PATTERNS
+
+
+def get_install_dirs(patterns=None):
+    """展开常见安装目录模式，返回实际存在的目录
+
+    Args:
+        patterns (list): 目录模式列表，默认为当前平台的常见安装目录
+
+    Returns:
+        list: 目录列表（去重并保持模式顺序）
+    """
+    install_dirs = []
+    seen = set()
+    for pattern in patterns or get_install_dir_patterns():
+        pattern = os.path.expanduser(os.path.expandvars(pattern))
+        # 环境变量未设置时保留原样，不应匹配任何目录
+        if '$' in pattern or '%' in pattern:
+            continue
+        for path in sorted(glob.glob(pattern)):
+            key = os.path.normcase(os.path.normpath(path))
+            if key not in seen and os.path.isdir(path):
+                seen.add(key)
+                install_dirs.append(path)
+    return install_dirs
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""SQLite软件清单存储模块
+
+每个安装（可执行文件路径）一行，按软件、版本、目录和文件指纹建立索引，
+同一版本的多个安装都会保留，按首次写入的顺序（seq列）返回。扫描器和界面只查询需要的行，
+不必每次读取和写回整个清单；写入在事务中完成，并发写入由SQLite加锁保证。
+
+sqlite3是可选的标准库模块（部分嵌入式Python不包含），不可用时扫描器继续使用JSON缓存。
+"""
+
+import os
+import tempfile
+import threading
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+
+# 数据库文件路径
+INVENTORY_DB_FILE = os.path.join(tempfile.gettempdir(), "software_scan_inventory.db")
+
+# 等待其他连接释放写锁的时间（秒）
+DB_TIMEOUT = 30
+
+# 表结构版本（PRAGMA user_version）
+SCHEMA_VERSION = 2
+
+# inode以文本保存：ReFS的文件ID为128位，超出SQLite的64位整数
+INSTALLATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    path TEXT PRIMARY KEY,
+    exe_name TEXT NOT NULL,
+    software TEXT,
+    version TEXT,
+    arch TEXT,
+    status TEXT,
+    directory TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode TEXT,
+    mode INTEGER,
+    seq INTEGER NOT NULL
+);
+"""
+
+SCHEMA = INSTALLATIONS_TABLE.format(name='installations') + """
+CREATE INDEX IF NOT EXISTS idx_installations_tool ON installations (exe_name);
+CREATE INDEX IF NOT EXISTS idx_installations_version ON installations (software, version);
+CREATE INDEX IF NOT EXISTS idx_installations_directory ON installations (directory);
+CREATE INDEX IF NOT EXISTS idx_installations_fingerprint ON installations (size, mtime_ns, inode);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL
+);
+"""
+
+
+# 本进程中已建立表结构的数据库文件，每个文件只检查一次
+_prepared_files = set()
+_prepare_lock = threading.Lock()
+
+
+def is_available():
+    """检查sqlite3模块是否可用"""
+    return sqlite3 is not None
+
+
+def connect(db_file=None, check_same_thread=True):
+    """打开数据库，本进程第一次打开该文件时建立表结构
+
+    Args:
+        db_file (str): 数据库文件路径，默认为INVENTORY_DB_FILE
+        check_same_thread (bool): 为False时连接可以在其他线程中使用（由调用方保证不并发）
+
+    Returns:
+        sqlite3.Connection: 数据库连接
+    """
+    db_file = db_file or INVENTORY_DB_FILE
+    conn = sqlite3.connect(db_file, timeout=DB_TIMEOUT, check_same_thread=check_same_thread)
+    if db_file not in _prepared_files:
+        with _prepare_lock:
+            if db_file not in _prepared_files:
+                _prepare(conn)
+                _prepared_files.add(db_file)
+    return conn
+
+
+def _prepare(conn):
+    """切换到WAL模式（写入数据库文件，之后的连接都沿用），并建立或升级表结构"""
+    # WAL模式下读取不阻塞写入
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _upgrade_schema(conn)
+    conn.executescript(SCHEMA)
+
+
+def _upgrade_schema(conn):
+    """将旧版本的表（inode为整数、没有mode和seq列）迁移到当前结构，保留原有条目和顺序"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # 其他连接可能已经完成迁移
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(installations)")}
+            if columns:
+                mode = 'mode' if 'mode' in columns else 'NULL'
+                conn.execute("DROP TABLE IF EXISTS installations_new")
+                conn.execute(INSTALLATIONS_TABLE.format(name='installations_new'))
+                conn.execute(
+                    "INSERT INTO installations_new "
+                    "(path, exe_name, software, version, arch, status, directory, size, mtime_ns, inode, mode, seq) "
+                    "SELECT path, exe_name, software, version, arch, status, directory, size, mtime_ns, "
+                    f"CAST(inode AS TEXT), {mode}, rowid FROM installations"
+                )
+                conn.execute("DROP TABLE installations")
+                conn.execute("ALTER TABLE installations_new RENAME TO installations")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _entry_to_row(path, entry, software_names):
+    """将缓存条目转换为数据库行"""
+    fingerprint = list(entry.get('fingerprint') or [])
+    fingerprint += [None] * (4 - len(fingerprint))
+    size, mtime_ns, inode, mode = fingerprint[:4]
+    return (
+        path,
+        entry['exe_name'],
+        software_names.get(entry['exe_name']),
+        entry.get('version'),
+        entry.get('arch'),
+        entry.get('status'),
+        os.path.dirname(path),
+        size,
+        mtime_ns,
+        None if inode is None else str(inode),
+        mode
+    )
+
+
+def _row_to_entry(row):
+    """将数据库行转换为缓存条目
+
+    Returns:
+        tuple: (可执行文件路径, 缓存条目)
+    """
+    path, exe_name, version, arch, status, size, mtime_ns, inode, mode = row
+    fingerprint = [size, mtime_ns, None if inode is None else int(inode)]
+    # 旧版本写入的行没有st_mode
+    if mode is not None:
+        fingerprint.append(mode)
+    return path, {
+        'exe_name': exe_name,
+        'fingerprint': fingerprint,
+        'version': version,
+        'arch': arch,
+        'status': status
+    }
+
+
+def load_entries(exe_name=None, db_file=None):
+    """读取缓存条目
+
+    Args:
+        exe_name (str): 只读取该可执行文件的条目，为None时读取全部
+        db_file (str): 数据库文件路径
+
+    Returns:
+        dict: 可执行文件路径 -> 缓存条目
+    """
+    query = "SELECT path, exe_name, version, arch, status, size, mtime_ns, inode, mode FROM installations"
+    params = ()
+    if exe_name is not None:
+        query += " WHERE exe_name = ?"
+        params = (exe_name,)
+    conn = connect(db_file)
+    try:
+        return dict(_row_to_entry(row) for row in conn.execute(query + " ORDER BY seq", params))
+    finally:
+        conn.close()
+
+
+def count_installations(db_file=None):
+    """统计探测成功的安装数，不读取条目本身"""
+    conn = connect(db_file)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM installations WHERE version IS NOT NULL AND software IS NOT NULL"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def load_meta(db_file=None):
+    """读取全盘扫描时间等元数据
+
+    Returns:
+        dict: 键 -> 值
+    """
+    conn = connect(db_file)
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    finally:
+        conn.close()
+
+
+def merge_entries(entries, software_names, removed_paths=(), meta=None, db_file=None):
+    """在一个事务中写入条目、删除条目并更新元数据
+
+    Args:
+        entries (dict): 可执行文件路径 -> 缓存条目
+        software_names (dict): 可执行文件名称 -> 软件名称
+        removed_paths (iterable): 要删除的路径
+        meta (dict): 要更新的元数据，值为None的键保持不变
+        db_file (str): 数据库文件路径
+    """
+    conn = connect(db_file)
+    try:
+        _merge(conn, entries, software_names, removed_paths, meta)
+    finally:
+        conn.close()
+
+
+def _merge(conn, entries, software_names, removed_paths=(), meta=None):
+    """在conn上用一个事务完成merge_entries()的写入"""
+    with conn:
+        conn.executemany(
+            "DELETE FROM installations WHERE path = ?",
+            ((path,) for path in removed_paths)
+        )
+        rows = [_entry_to_row(path, entry, software_names) for path, entry in entries.items()]
+        # 已有的路径原地更新，保持原来的顺序；新路径追加到末尾
+        conn.executemany(
+            "UPDATE installations SET exe_name = ?, software = ?, version = ?, arch = ?, status = ?, "
+            "directory = ?, size = ?, mtime_ns = ?, inode = ?, mode = ? WHERE path = ?",
+            (row[1:] + row[:1] for row in rows)
+        )
+        next_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM installations").fetchone()[0]
+        conn.executemany(
+            "INSERT OR IGNORE INTO installations "
+            "(path, exe_name, software, version, arch, status, directory, size, mtime_ns, inode, mode, seq) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (row + (next_seq + offset,) for offset, row in enumerate(rows))
+        )
+        for key, value in (meta or {}).items():
+            if value is not None:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+class EntryWriter:
+    """一次扫描共用的写入连接，逐条写入探测结果
+
+    全盘扫描的每个探测结果都要立即写入（中断后从检查点继续时不会丢失），
+    工作线程共用一个连接，不必为每一条记录重新打开数据库。
+    每条记录仍是一个事务：WAL模式下synchronous=NORMAL，提交时不等待fsync，
+    进程崩溃时已提交的记录不会丢失。
+    """
+    def __init__(self, software_names, db_file=None):
+        # 可执行文件名称 -> 软件名称
+        self.software_names = software_names
+        self.db_file = db_file
+        # 第一次写入时打开的连接
+        self.conn = None
+        # 工作线程依次使用连接
+        self.lock = threading.Lock()
+
+    def write(self, path, entry):
+        """写入一条缓存条目（可在任意线程中调用）"""
+        with self.lock:
+            if self.conn is None:
+                self.conn = connect(self.db_file, check_same_thread=False)
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+            _merge(self.conn, {path: entry}, self.software_names)
+
+    def close(self):
+        """关闭连接"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+class CacheView:
+    """按路径和文件指纹查询的缓存条目，可代替 路径 -> 缓存条目 字典传给扫描器
+
+    扫描器只查询遇到的候选路径，不把整个清单读入内存；同一个视图上的查询共用一个连接。
+    """
+    def __init__(self, db_file=None):
+        self.db_file = db_file
+        # 第一次查询时打开的连接
+        self.conn = None
+        # 查询可能来自不同线程，依次使用连接
+        self.lock = threading.Lock()
+
+    def _query(self, query, params=()):
+        with self.lock:
+            if self.conn is None:
+                self.conn = connect(self.db_file, check_same_thread=False)
+            return self.conn.execute(query, params).fetchall()
+
+    def get(self, path, default=None):
+        """查询单个路径的缓存条目，没有时返回default"""
+        rows = self._query(
+            "SELECT path, exe_name, version, arch, status, size, mtime_ns, inode, mode "
+            "FROM installations WHERE path = ?",
+            (path,)
+        )
+        return _row_to_entry(rows[0])[1] if rows else default
+
+    def find_fingerprint(self, exe_name, fingerprint):
+        """经指纹索引查找同一文件在其他路径下的条目（如移动或重命名过的安装目录、硬链接）
+
+        Args:
+            exe_name (str): 可执行文件名称
+            fingerprint (list): [大小, 修改时间(纳秒), inode, st_mode]
+
+        Returns:
+            dict: 最先写入的匹配条目，没有时返回None
+        """
+        size, mtime_ns, inode, mode = fingerprint
+        rows = self._query(
+            "SELECT path, exe_name, version, arch, status, size, mtime_ns, inode, mode "
+            "FROM installations WHERE size = ? AND mtime_ns = ? AND inode = ? AND mode = ? AND exe_name = ? "
+            "ORDER BY seq LIMIT 1",
+            (size, mtime_ns, str(inode), mode, exe_name)
+        )
+        return _row_to_entry(rows[0])[1] if rows else None
+
+    def list_paths(self):
+        """列出全部条目的 (可执行文件名称, 路径)，按首次写入的顺序排列"""
+        return self._query("SELECT exe_name, path FROM installations ORDER BY seq")
+
+    def __iter__(self):
+        return iter([path for _, path in self.list_paths()])
+
+    def close(self):
+        """关闭连接"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+def query_installations(software=None, version=None, directory=None, db_file=None):
+    """查询探测成功的安装，同一版本的多个安装全部返回
+
+    Args:
+        software (str): 软件名称
+        version (str): 版本号
+        directory (str): 可执行文件所在目录
+        db_file (str): 数据库文件路径
+
+    Returns:
+        list: (软件名称, 版本号, 安装路径, 架构) 列表，按首次写入的顺序排列
+    """
+    conditions = ["version IS NOT NULL", "software IS NOT NULL"]
+    params = []
+    for column, value in (('software', software), ('version', version), ('directory', directory)):
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    conn = connect(db_file)
+    try:
+        return conn.execute(
+            "SELECT software, version, path, arch FROM installations WHERE "
+            + " AND ".join(conditions) + " ORDER BY seq",
+            params
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def query_archs(paths, db_file=None):
+    """查询指定路径的架构
+
+    Args:
+        paths (iterable): 可执行文件路径
+        db_file (str): 数据库文件路径
+
+    Returns:
+        dict: 可执行文件路径 -> 架构
+    """
+    conn = connect(db_file)
+    try:
+        return {
+            path: arch
+            for path in paths
+            for arch, in conn.execute("SELECT arch FROM installations WHERE path = ?", (path,))
+        }
+    finally:
+        conn.close()
+
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""locate数据库模块
+
+大多数Linux主机每天由updatedb刷新一次mlocate/plocate数据库。数据库可用时，
+全盘扫描直接从中取出文件名匹配的路径作为候选，不再遍历磁盘。
+
+- mlocate数据库（\\0mlocate）和GNU findutils的LOCATE02数据库直接解析；
+- plocate数据库是zstd压缩的倒排索引，以及没有读取权限的数据库（通常只对mlocate/plocate组可读），
+  交给系统的plocate/locate命令（setgid）按文件名查询。
+
+数据库不存在、过期或读取失败时返回None，由调用方退回到目录遍历。
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import time
+
+
+# 按优先顺序查找的数据库文件
+LOCATE_DB_FILES = [
+    '/var/lib/plocate/plocate.db',
+    '/var/lib/mlocate/mlocate.db',
+    '/var/cache/locate/locatedb',
+    '/var/lib/locate/locatedb',
+]
+
+# 数据库超过这个时间没有更新时不使用（秒）
+LOCATE_DB_MAX_AGE = 3 * 24 * 3600
+
+# 查询命令的超时时间（秒）
+LOCATE_COMMAND_TIMEOUT = 30
+
+MLOCATE_MAGIC = b'\0mlocate'
+PLOCATE_MAGIC = b'\0plocate'
+LOCATE02_MAGIC = b'\0LOCATE02\0'
+
+# mlocate文件头：魔数(8) + 配置块大小(4) + 版本(1) + 可见性标记(1) + 填充(2)
+MLOCATE_HEADER_SIZE = 16
+# mlocate目录头：秒(8) + 纳秒(4) + 填充(4)
+MLOCATE_DIR_HEADER_SIZE = 16
+# mlocate目录项类型
+MLOCATE_FILE = 0
+MLOCATE_END = 2
+
+
+def find_locate_db(max_age=None):
+    """查找可用的locate数据库
+
+    Args:
+        max_age (float): 最长允许的数据库年龄（秒），默认为LOCATE_DB_MAX_AGE
+
+    Returns:
+        str: 数据库文件路径，没有足够新的数据库时返回None
+    """
+    max_age = LOCATE_DB_MAX_AGE if max_age is None else max_age
+    for db_file in LOCATE_DB_FILES:
+        try:
+            if time.time() - os.stat(db_file).st_mtime < max_age:
+                return db_file
+        except OSError:
+            continue
+    return None
+
+
+def _names_pattern(file_names):
+    """生成匹配任一文件名的正则表达式（bytes）"""
+    names = sorted((os.fsencode(name) for name in file_names), key=len, reverse=True)
+    return b'|'.join(re.escape(name) for name in names)
+
+
+def parse_mlocate(data, file_names):
+    """解析mlocate数据库，产出文件名匹配的普通文件
+
+    每个目录先找到目录项块的结束标记，再在块内用一次正则查找匹配的文件名，
+    不逐项解析不相关的文件名。文件名中不含NUL，块内 "NUL + 类型2" 只可能是结束标记。
+
+    Args:
+        data (bytes): 数据库内容
+        file_names (dict): 文件名 -> 匹配键
+
+    Yields:
+        tuple: (匹配键, 文件路径)
+    """
+    # 上一项的NUL结尾 + 普通文件类型 + 文件名 + NUL
+    entry_re = re.compile(b'\\x00\\x00(' + _names_pattern(file_names) + b')(?=\\x00)')
+    end_marker = bytes([0, MLOCATE_END])
+
+    conf_size = int.from_bytes(data[8:12], 'big')
+    # 根目录路径之后是配置块
+    pos = data.index(b'\0', MLOCATE_HEADER_SIZE) + 1 + conf_size
+    size = len(data)
+    while pos < size:
+        path_start = pos + MLOCATE_DIR_HEADER_SIZE
+        path_end = data.find(b'\0', path_start)
+        if path_end < 0:
+            break
+        block_end = data.find(end_marker, path_end)
+        if block_end < 0:
+            break
+        directory = None
+        for match in entry_re.finditer(data, path_end, block_end + 1):
+            if directory is None:
+                directory = os.fsdecode(data[path_start:path_end])
+            name = os.fsdecode(match.group(1))
+            yield file_names[name], os.path.join(directory, name)
+        pos = block_end + 2
+
+
+def parse_locate02(data, file_names):
+    """解析GNU findutils的LOCATE02数据库（前缀压缩），产出文件名匹配的路径
+
+    Args:
+        data (bytes): 数据库内容
+        file_names (dict): 文件名 -> 匹配键
+
+    Yields:
+        tuple: (匹配键, 文件路径)
+    """
+    pos = len(LOCATE02_MAGIC)
+    size = len(data)
+    path = b''
+    prefix_len = 0
+    while pos < size:
+        offset = data[pos]
+        pos += 1
+        if offset == 0x80:
+            offset = int.from_bytes(data[pos:pos + 2], 'big', signed=True)
+            pos += 2
+        elif offset > 0x7f:
+            offset -= 0x100
+        prefix_len += offset
+        end = data.find(b'\0', pos)
+        if end < 0:
+            break
+        path = path[:prefix_len] + data[pos:end]
+        pos = end + 1
+        key = file_names.get(os.fsdecode(os.path.basename(path)))
+        if key:
+            yield key, os.fsdecode(path)
+
+
+def query_locate_command(db_file, file_names):
+    """用系统的plocate/locate命令按文件名查询
+
+    Args:
+        db_file (str): 数据库文件路径
+        file_names (dict): 文件名 -> 匹配键
+
+    Returns:
+        list: (匹配键, 文件路径) 列表，没有可用命令或查询失败时返回None
+    """
+    command = shutil.which('plocate') or shutil.which('locate')
+    if not command:
+        return None
+    pattern = '^(' + '|'.join(re.escape(name) for name in file_names) + ')$'
+    try:
+        result = subprocess.run(
+            [command, '--database', db_file, '--basename', '--regex', pattern],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=LOCATE_COMMAND_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # 没有匹配时返回码为1
+    if result.returncode not in (0, 1):
+        return None
+    candidates = []
+    for line in result.stdout.splitlines():
+        path = os.fsdecode(line)
+        key = file_names.get(os.path.basename(path))
+        # 命令输出也包含同名目录
+        if key and os.path.isfile(path):
+            candidates.append((key, path))
+    return candidates
+
+
+def get_locate_candidates(file_names, db_file=None):
+    """从locate数据库中取出文件名匹配的路径
+
+    Args:
+        file_names (dict): 文件名 -> 匹配键
+        db_file (str): 数据库文件路径，默认查找LOCATE_DB_FILES中足够新的数据库
+
+    Returns:
+        list: (匹配键, 文件路径) 列表，没有可用的数据库时返回None
+    """
+    if os.name == 'nt':
+        return None
+    db_file = db_file or find_locate_db()
+    if not db_file:
+        return None
+    try:
+        with open(db_file, 'rb') as f:
+            data = f.read()
+    except OSError:
+        # 数据库只对locate组可读，交给setgid的查询命令
+        return query_locate_command(db_file, file_names)
+    try:
+        if data.startswith(MLOCATE_MAGIC):
+            return list(parse_mlocate(data, file_names))
+        if data.startswith(LOCATE02_MAGIC):
+            return list(parse_locate02(data, file_names))
+    except (ValueError, IndexError, KeyError):
+        return None
+    if data.startswith(PLOCATE_MAGIC):
+        return query_locate_command(db_file, file_names)
+    return None
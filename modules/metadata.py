@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""安装元数据读取模块
+
+从可执行文件旁边随安装包一起发布的文件中读取版本号，无需启动子进程：
+- Java: JDK/JRE根目录下的release文件
+- Node.js: include/node/node_version.h
+- Python: pyvenv.cfg，以及lib/pythonX.Y、pythonXY.dll布局定位的patchlevel.h
+- Git: share/git-core所在安装前缀下的发行说明
+- Go: GOROOT下的VERSION文件
+- Maven/Gradle: lib目录中核心jar文件的文件名
+"""
+
+import os
+import re
+
+
+def _read_text(path, limit=65536):
+    """读取文本文件开头部分，失败时返回None"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(limit)
+    except OSError:
+        return None
+
+
+def _exe_dirs(exe_path):
+    """获取可执行文件所在目录及其上一级目录
+
+    会先解析符号链接，使/usr/bin/java这类链接指向真实的安装目录。
+
+    Returns:
+        tuple: (可执行文件目录, 上一级目录)
+    """
+    real_path = os.path.realpath(exe_path)
+    exe_dir = os.path.dirname(real_path)
+    return exe_dir, os.path.dirname(exe_dir)
+
+
+def read_java_version(exe_path):
+    """从JDK/JRE的release文件读取Java版本
+
+    <home>/bin/java 对应 <home>/release；
+    JDK 8自带的 <jdk>/jre/bin/java 对应 <jdk>/release。
+    """
+    exe_dir, home = _exe_dirs(exe_path)
+    for base in (home, os.path.dirname(home)):
+        content = _read_text(os.path.join(base, 'release'))
+        if content:
+            match = re.search(r'^JAVA_VERSION="([^"]+)"', content, re.MULTILINE)
+            if match:
+                return match.group(1)
+    return None
+
+
+def read_node_version(exe_path):
+    """从include/node/node_version.h读取Node.js版本
+
+    Linux/macOS发行包为 <prefix>/bin/node，Windows为 <prefix>/node.exe。
+    """
+    exe_dir, prefix = _exe_dirs(exe_path)
+    for base in (prefix, exe_dir):
+        content = _read_text(os.path.join(base, 'include', 'node', 'node_version.h'))
+        if not content:
+            continue
+        parts = []
+        for name in ('MAJOR', 'MINOR', 'PATCH'):
+            match = re.search(rf'#define\s+NODE_{name}_VERSION\s+(\d+)', content)
+            if not match:
+                break
+            parts.append(match.group(1))
+        else:
+            return '.'.join(parts)
+    return None
+
+
+def _read_pyvenv_version(venv_dir):
+    """从虚拟环境的pyvenv.cfg读取Python版本"""
+    content = _read_text(os.path.join(venv_dir, 'pyvenv.cfg'))
+    if not content:
+        return None
+    # venv写入version，virtualenv写入version_info（如3.12.1.final.0）
+    match = re.search(r'^\s*version(?:_info)?\s*=\s*(\d+\.\d+\.\d+)', content, re.MULTILINE)
+    if match:
+        return match.group(1)
+    return None
+
+
+def _python_minor_versions(exe_path, exe_dir, prefix):
+    """根据安装布局推断Python的主次版本号
+
+    依次使用：可执行文件真实名称（python3.11）、Windows下的pythonXY.dll、
+    POSIX下的lib/pythonX.Y目录。存在多个候选时返回全部。
+
+    Returns:
+        list: 主次版本号列表，如 ['3.11']
+    """
+    match = re.match(r'python(\d+)\.(\d+)$', os.path.basename(os.path.realpath(exe_path)))
+    if match:
+        return [f"{match.group(1)}.{match.group(2)}"]
+
+    versions = []
+    try:
+        for name in os.listdir(exe_dir):
+            match = re.match(r'python(\d)(\d+)\.dll$', name, re.IGNORECASE)
+            if match:
+                versions.append(f"{match.group(1)}.{match.group(2)}")
+    except OSError:
+        pass
+    if versions:
+        return versions
+
+    try:
+        for name in os.listdir(os.path.join(prefix, 'lib')):
+            match = re.match(r'python(\d+)\.(\d+)$', name)
+            if match:
+                versions.append(f"{match.group(1)}.{match.group(2)}")
+    except OSError:
+        pass
+    return versions
+
+
+def read_python_version(exe_path):
+    """从pyvenv.cfg或安装布局读取Python版本
+
+    布局只能确定主次版本号，补丁号取自同一安装中的patchlevel.h；
+    主次版本号不唯一或无法得到完整的X.Y.Z时返回None。
+    """
+    exe_dir, prefix = _exe_dirs(exe_path)
+
+    # 虚拟环境：<venv>/bin/python 或 <venv>/Scripts/python.exe
+    venv_dir = os.path.dirname(os.path.dirname(os.path.abspath(exe_path)))
+    version = _read_pyvenv_version(venv_dir)
+    if version:
+        return version
+
+    minor_versions = _python_minor_versions(exe_path, exe_dir, prefix)
+    if len(minor_versions) != 1:
+        return None
+    minor_version = minor_versions[0]
+
+    # POSIX: <prefix>/include/pythonX.Y/patchlevel.h；Windows: <root>/include/patchlevel.h
+    for header in (
+        os.path.join(prefix, 'include', f"python{minor_version}", 'patchlevel.h'),
+        os.path.join(exe_dir, 'include', 'patchlevel.h'),
+    ):
+        content = _read_text(header)
+        if content:
+            match = re.search(r'#define\s+PY_VERSION\s+"(\d+\.\d+\.\d+)', content)
+            if match and match.group(1).startswith(f"{minor_version}."):
+                return match.group(1)
+    return None
+
+
+def _find_git_prefix(exe_path):
+    """查找包含share/git-core的Git安装前缀
+
+    覆盖 <prefix>/bin/git、Git for Windows的 <root>/cmd/git.exe
+    以及 <root>/mingw64/bin/git.exe 等布局。
+    """
+    exe_dir, prefix = _exe_dirs(exe_path)
+    for base in (prefix, os.path.dirname(prefix)):
+        for sub_prefix in ('', 'mingw64', 'mingw32', 'clangarm64'):
+            candidate = os.path.join(base, sub_prefix) if sub_prefix else base
+            if os.path.isdir(os.path.join(candidate, 'share', 'git-core', 'templates')):
+                return base, candidate
+    return None, None
+
+
+def read_git_version(exe_path):
+    """从Git安装前缀下的发行说明读取Git版本
+
+    share/git-core/templates本身不含版本号，只用来确认安装前缀；
+    版本号取自Git for Windows的ReleaseNotes.html，
+    或发行版打包的share/doc/git/RelNotes中最新的一份。
+    """
+    root, prefix = _find_git_prefix(exe_path)
+    if not prefix:
+        return None
+
+    for base in (root, os.path.dirname(root)):
+        content = _read_text(os.path.join(base, 'ReleaseNotes.html'), limit=4096)
+        if content:
+            match = re.search(r'Git for Windows v(\d+\.\d+\.\d+)', content)
+            if match:
+                return match.group(1)
+
+    versions = []
+    try:
+        for name in os.listdir(os.path.join(prefix, 'share', 'doc', 'git', 'RelNotes')):
+            match = re.match(r'(\d+)\.(\d+)\.(\d+)\.txt$', name)
+            if match:
+                versions.append(tuple(int(part) for part in match.groups()))
+    except OSError:
+        pass
+    if versions:
+        return '.'.join(str(part) for part in max(versions))
+    return None
+
+
+def read_go_version(exe_path):
+    """从GOROOT下的VERSION文件读取Go版本
+
+    <goroot>/bin/go 对应 <goroot>/VERSION，首行形如 go1.21.5。
+    """
+    exe_dir, goroot = _exe_dirs(exe_path)
+    content = _read_text(os.path.join(goroot, 'VERSION'), limit=256)
+    if content:
+        match = re.match(r'go(\d+\.\d+(?:\.\d+)?)', content)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _read_lib_jar_version(exe_path, pattern):
+    """从 <home>/lib 下的jar文件名读取版本"""
+    exe_dir, home = _exe_dirs(exe_path)
+    try:
+        for name in os.listdir(os.path.join(home, 'lib')):
+            match = re.match(pattern, name)
+            if match:
+                return match.group(1)
+    except OSError:
+        pass
+    return None
+
+
+def read_maven_version(exe_path):
+    """从 <maven>/lib/maven-core-X.Y.Z.jar 读取Maven版本"""
+    return _read_lib_jar_version(exe_path, r'maven-core-(\d+\.\d+\.\d+)\.jar$')
+
+
+def read_gradle_version(exe_path):
+    """从 <gradle>/lib/gradle-launcher-X.Y.jar 读取Gradle版本"""
+    return _read_lib_jar_version(exe_path, r'gradle-(?:launcher|core-api)-(\d+\.\d+(?:\.\d+)?)\.jar$')
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""挂载表模块
+
+全盘扫描的起始目录从挂载表中选取：伪文件系统（/proc、/sys、/dev、tmpfs、cgroup等）、
+容器的overlay挂载和网络文件系统（NFS、SMB等）默认不扫描，它们的挂载点在遍历时整棵跳过。
+Linux下读取/proc/self/mounts，Windows下按驱动器类型排除网络驱动器和光驱，
+其他系统读取不到挂载表时退回到根目录。
+"""
+
+import os
+import re
+
+
+# Linux挂载表
+MOUNT_TABLE_FILE = "/proc/self/mounts"
+
+# 伪文件系统和只读镜像，不包含已安装的软件
+PSEUDO_FS_TYPES = {
+    'proc', 'sysfs', 'devtmpfs', 'devpts', 'tmpfs', 'ramfs', 'cgroup', 'cgroup2',
+    'securityfs', 'debugfs', 'tracefs', 'pstore', 'bpf', 'mqueue', 'hugetlbfs',
+    'configfs', 'fusectl', 'autofs', 'binfmt_misc', 'efivarfs', 'nsfs', 'rpc_pipefs',
+    'nfsd', 'selinuxfs', 'squashfs', 'fuse.gvfsd-fuse', 'fuse.portal', 'fuse.lxcfs',
+}
+
+# 网络文件系统
+NETWORK_FS_TYPES = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', 'ceph', 'glusterfs', 'lustre',
+    'gpfs', '9p', 'davfs', 'fuse.sshfs', 'fuse.rclone', 'fuse.s3fs', 'fuse.glusterfs',
+}
+
+# Windows驱动器类型（GetDriveTypeW的返回值）
+DRIVE_NO_ROOT_DIR = 1
+DRIVE_REMOTE = 4
+DRIVE_CDROM = 5
+
+
+def _unescape_mount_field(field):
+    """还原挂载表字段中的八进制转义（如空格写作\\040）"""
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), field)
+
+
+def read_mount_table(mount_table_file=None):
+    """读取挂载表
+
+    Args:
+        mount_table_file (str): 挂载表文件路径，默认为MOUNT_TABLE_FILE
+
+    Returns:
+        list: (挂载点, 文件系统类型) 列表，读取失败时为空列表
+    """
+    mounts = []
+    try:
+        with open(mount_table_file or MOUNT_TABLE_FILE, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    mounts.append((_unescape_mount_field(fields[1]), fields[2]))
+    except OSError:
+        pass
+    return mounts
+
+
+def is_scannable_mount(mount_point, fs_type, include_network=False):
+    """检查挂载是否需要扫描
+
+    Args:
+        mount_point (str): 挂载点
+        fs_type (str): 文件系统类型
+        include_network (bool): 是否扫描网络文件系统
+
+    Returns:
+        bool: 需要扫描时返回True
+    """
+    if fs_type in PSEUDO_FS_TYPES:
+        return False
+    if fs_type in NETWORK_FS_TYPES or fs_type.startswith('nfs'):
+        return include_network
+    # 容器根目录以外的overlay挂载是镜像层的重复内容
+    if fs_type == 'overlay':
+        return mount_point == '/'
+    return True
+
+
+def get_windows_drives(include_network=False):
+    """获取Windows驱动器，默认排除网络驱动器和光驱"""
+    import ctypes
+    drives = []
+    drives_bitmask = ctypes.windll.kernel32.GetLogicalDrives()
+    for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        if drives_bitmask & 1:
+            drive = f"{letter}:\\"
+            drive_type = ctypes.windll.kernel32.GetDriveTypeW(drive)
+            skipped = drive_type in (DRIVE_NO_ROOT_DIR, DRIVE_CDROM) \
+                or (drive_type == DRIVE_REMOTE and not include_network)
+            if not skipped:
+                drives.append(drive)
+        drives_bitmask >>= 1
+    return drives
+
+
+def get_scan_mounts(include_network=False, mount_table_file=None):
+    """从挂载表中选取全盘扫描的起始目录和需要跳过的挂载点
+
+    同一挂载点被多次挂载时以最后一次为准（后挂载的覆盖先挂载的）。
+
+    Args:
+        include_network (bool): 是否扫描网络文件系统
+        mount_table_file (str): 挂载表文件路径
+
+    Returns:
+        tuple: (起始目录列表, 需要跳过的挂载点集合)
+    """
+    if os.name == 'nt':
+        return get_windows_drives(include_network), set()
+
+    mount_types = {}
+    for mount_point, fs_type in read_mount_table(mount_table_file):
+        mount_types[mount_point] = fs_type
+    if not mount_types:
+        return ['/'], set()
+
+    roots = []
+    pruned = set()
+    for mount_point, fs_type in mount_types.items():
+        if is_scannable_mount(mount_point, fs_type, include_network):
+            roots.append(mount_point)
+        else:
+            pruned.add(mount_point)
+    if not roots:
+        return ['/'], pruned
+    # 父目录在前，遍历到的嵌套挂载点由已访问目录集合去重
+    roots.sort(key=lambda path: (path.count('/'), path))
+    return roots, pruned
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""版本探测子进程管理模块
+
+为每个探测子进程设置截止时间以及CPU时间和内存上限，超时后结束整个进程树：
+- Windows：子进程以挂起状态启动，放入作业对象（Job Object）后再恢复运行，
+  它启动的所有后代进程都在作业中；超时时结束整个作业
+- POSIX：子进程使用独立的会话（进程组），通过prlimit设置资源上限，超时时结束整个进程组
+
+包装脚本启动的孙进程会继承输出管道，只结束直接子进程会让读取管道一直阻塞，
+所以超时后必须结束整个进程树。
+"""
+
+import asyncio
+import ctypes
+import os
+import signal
+import subprocess
+
+
+# 单次探测的截止时间（秒）
+PROBE_TIMEOUT = 10
+
+# 探测进程的CPU时间上限（秒）
+PROBE_CPU_LIMIT = 10
+
+# 探测进程的内存上限（字节）
+PROBE_MEMORY_LIMIT = 2 * 1024 * 1024 * 1024
+
+# 结束进程树后等待管道关闭的时间（秒）
+KILL_GRACE_PERIOD = 2
+
+# 隐藏子进程窗口（仅Windows有效）
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+# 以挂起状态启动子进程（仅Windows有效），放入作业对象后再恢复运行
+CREATE_SUSPENDED = 0x00000004
+
+# Windows作业对象常量
+JOB_OBJECT_LIMIT_PROCESS_TIME = 0x00000002
+JOB_OBJECT_LIMIT_PROCESS_MEMORY = 0x00000100
+JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x00002000
+JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS = 9
+PROCESS_SET_QUOTA = 0x0100
+PROCESS_TERMINATE = 0x0001
+PROCESS_SUSPEND_RESUME = 0x0800
+
+
+class _IoCounters(ctypes.Structure):
+    _fields_ = [(name, ctypes.c_ulonglong) for name in (
+        'ReadOperationCount', 'WriteOperationCount', 'OtherOperationCount',
+        'ReadTransferCount', 'WriteTransferCount', 'OtherTransferCount'
+    )]
+
+
+class _BasicLimitInformation(ctypes.Structure):
+    _fields_ = [
+        ('PerProcessUserTimeLimit', ctypes.c_longlong),
+        ('PerJobUserTimeLimit', ctypes.c_longlong),
+        ('LimitFlags', ctypes.c_uint32),
+        ('MinimumWorkingSetSize', ctypes.c_size_t),
+        ('MaximumWorkingSetSize', ctypes.c_size_t),
+        ('ActiveProcessLimit', ctypes.c_uint32),
+        ('Affinity', ctypes.c_size_t),
+        ('PriorityClass', ctypes.c_uint32),
+        ('SchedulingClass', ctypes.c_uint32),
+    ]
+
+
+class _ExtendedLimitInformation(ctypes.Structure):
+    _fields_ = [
+        ('BasicLimitInformation', _BasicLimitInformation),
+        ('IoInfo', _IoCounters),
+        ('ProcessMemoryLimit', ctypes.c_size_t),
+        ('JobMemoryLimit', ctypes.c_size_t),
+        ('PeakProcessMemoryUsed', ctypes.c_size_t),
+        ('PeakJobMemoryUsed', ctypes.c_size_t),
+    ]
+
+
+def get_popen_kwargs():
+    """获取启动探测子进程时使用的参数"""
+    if os.name == 'nt':
+        # 挂起启动，子进程在放入作业对象之前不会运行，也就不会启动逃出作业的后代进程
+        return {'creationflags': CREATE_NO_WINDOW | CREATE_SUSPENDED}
+    # 独立会话，超时时可以结束整个进程组
+    return {'start_new_session': True}
+
+
+def _get_kernel32():
+    """获取声明了句柄类型的kernel32函数（仅Windows）"""
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.CreateJobObjectW.argtypes = [wintypes.LPVOID, wintypes.LPCWSTR]
+    kernel32.SetInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, wintypes.LPVOID, wintypes.DWORD]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+    kernel32.TerminateJobObject.argtypes = [wintypes.HANDLE, wintypes.UINT]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    return kernel32
+
+
+def _resume_process(pid):
+    """恢复以CREATE_SUSPENDED启动的进程（仅Windows）
+
+    subprocess不保留主线程句柄，使用NtResumeProcess恢复进程中的所有线程。
+
+    Returns:
+        bool: 成功时返回True
+    """
+    try:
+        from ctypes import wintypes
+        kernel32 = _get_kernel32()
+        ntdll = ctypes.WinDLL('ntdll')
+        ntdll.NtResumeProcess.argtypes = [wintypes.HANDLE]
+        process = kernel32.OpenProcess(PROCESS_SUSPEND_RESUME, False, pid)
+        if not process:
+            return False
+        try:
+            return ntdll.NtResumeProcess(process) == 0
+        finally:
+            kernel32.CloseHandle(process)
+    except:
+        return False
+
+
+def _create_job(pid):
+    """创建带资源上限的作业对象，并将进程放入其中（仅Windows）
+
+    Returns:
+        int: 作业对象句柄，进程没有放入作业时返回None
+    """
+    try:
+        kernel32 = _get_kernel32()
+        job = kernel32.CreateJobObjectW(None, None)
+        if not job:
+            return None
+
+        info = _ExtendedLimitInformation()
+        info.BasicLimitInformation.LimitFlags = (
+            JOB_OBJECT_LIMIT_PROCESS_TIME
+            | JOB_OBJECT_LIMIT_PROCESS_MEMORY
+            | JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+        )
+        # 以100纳秒为单位
+        info.BasicLimitInformation.PerProcessUserTimeLimit = PROBE_CPU_LIMIT * 10 ** 7
+        info.ProcessMemoryLimit = PROBE_MEMORY_LIMIT
+        kernel32.SetInformationJobObject(
+            job, JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS,
+            ctypes.byref(info), ctypes.sizeof(info)
+        )
+
+        assigned = False
+        process = kernel32.OpenProcess(PROCESS_SET_QUOTA | PROCESS_TERMINATE, False, pid)
+        if process:
+            assigned = kernel32.AssignProcessToJobObject(job, process)
+            kernel32.CloseHandle(process)
+        if not assigned:
+            # 结束空的作业对其中的进程没有作用，由调用方退回到taskkill
+            kernel32.CloseHandle(job)
+            return None
+        return job
+    except:
+        return None
+
+
+def apply_limits(pid):
+    """为已启动的探测子进程设置资源上限
+
+    Windows下子进程以挂起状态启动（见get_popen_kwargs()），放入作业对象后在这里恢复运行；
+    POSIX下使用prlimit在进程外设置，避免在多线程程序中使用preexec_fn。
+
+    Args:
+        pid (int): 子进程ID
+
+    Returns:
+        int: Windows下的作业对象句柄（没能放入作业时为None），其他平台返回None
+
+    Raises:
+        OSError: Windows下无法恢复挂起的子进程，子进程已被结束
+    """
+    if os.name == 'nt':
+        job = _create_job(pid)
+        if not _resume_process(pid):
+            kill_process_tree(pid, job)
+            close_job(job)
+            raise OSError(f"无法恢复探测子进程 {pid}")
+        return job
+
+    try:
+        import resource
+        resource.prlimit(pid, resource.RLIMIT_CPU, (PROBE_CPU_LIMIT, PROBE_CPU_LIMIT))
+        # RLIMIT_DATA不计算JVM等只保留不提交的地址空间，比RLIMIT_AS更适合限制探测进程
+        resource.prlimit(pid, resource.RLIMIT_DATA, (PROBE_MEMORY_LIMIT, PROBE_MEMORY_LIMIT))
+    except:
+        pass
+    return None
+
+
+def kill_process_tree(pid, job=None):
+    """结束探测子进程及其所有后代进程
+
+    Args:
+        pid (int): 子进程ID
+        job (int): Windows下的作业对象句柄
+    """
+    try:
+        if os.name == 'nt':
+            if job:
+                _get_kernel32().TerminateJobObject(job, 1)
+            else:
+                _taskkill_tree(pid)
+        else:
+            os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _taskkill_tree(pid):
+    """没有作业对象时用taskkill按父进程关系结束进程树（仅Windows）
+
+    需要在结束直接子进程之前调用，子进程退出后无法再找到它的后代进程。
+    """
+    try:
+        subprocess.run(
+            ['taskkill', '/T', '/F', '/PID', str(pid)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            creationflags=CREATE_NO_WINDOW, timeout=KILL_GRACE_PERIOD
+        )
+    except (OSError, subprocess.SubprocessError):
+        os.kill(pid, signal.SIGTERM)
+
+
+def close_job(job):
+    """关闭作业对象句柄"""
+    if job:
+        try:
+            _get_kernel32().CloseHandle(job)
+        except:
+            pass
+
+
+def run_probe(command, timeout=None):
+    """运行探测命令
+
+    Args:
+        command (list): 命令行参数列表
+        timeout (float): 截止时间（秒），默认为PROBE_TIMEOUT
+
+    Returns:
+        tuple: (返回码, 标准输出, 标准错误, 是否超时)
+    """
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace',
+        **get_popen_kwargs()
+    )
+    job = None
+    try:
+        job = apply_limits(process.pid)
+        stdout, stderr = process.communicate(timeout=timeout or PROBE_TIMEOUT)
+        return process.returncode, stdout, stderr, False
+    except subprocess.TimeoutExpired:
+        kill_process_tree(process.pid, job)
+        process.kill()
+        try:
+            process.communicate(timeout=KILL_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            pass
+        return process.returncode, '', '', True
+    finally:
+        close_job(job)
+
+
+async def run_probe_async(command, timeout=None):
+    """异步运行探测命令
+
+    Args:
+        command (list): 命令行参数列表
+        timeout (float): 截止时间（秒），默认为PROBE_TIMEOUT
+
+    Returns:
+        tuple: (返回码, 标准输出, 标准错误, 是否超时)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        **get_popen_kwargs()
+    )
+    job = None
+    try:
+        job = apply_limits(process.pid)
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout or PROBE_TIMEOUT)
+        return (
+            process.returncode,
+            stdout.decode(errors='replace'),
+            stderr.decode(errors='replace'),
+            False
+        )
+    except asyncio.TimeoutError:
+        kill_process_tree(process.pid, job)
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        try:
+            await asyncio.wait_for(process.wait(), KILL_GRACE_PERIOD)
+        except asyncio.TimeoutError:
+            pass
+        return process.returncode, '', '', True
+    except asyncio.CancelledError:
+        kill_process_tree(process.pid, job)
+        raise
+    finally:
+        close_job(job)
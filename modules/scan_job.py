@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""全盘扫描任务模块
+
+ScanJob记录一次全盘扫描的进度（已访问目录数、匹配文件数、待完成探测数），
+支持暂停、继续和取消，并维护遍历前沿：已入队但尚未处理完的目录，
+以及已找到但尚未得到探测结果的候选文件。
+前沿定期通过回调保存为检查点，中断的扫描可以从检查点继续，而不必从根目录重新开始。
+"""
+
+import threading
+import time
+
+
+# 任务状态
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_PAUSED = 'paused'
+JOB_CANCELLED = 'cancelled'
+JOB_FINISHED = 'finished'
+
+# 保存检查点的最短间隔（秒）
+CHECKPOINT_INTERVAL = 5
+
+
+class ScanJob:
+    """全盘扫描任务"""
+    def __init__(self, checkpoint_callback=None):
+        # 保护计数器和前沿
+        self.lock = threading.Lock()
+        # 状态
+        self.state = JOB_PENDING
+        # 进度计数
+        self.dirs_visited = 0
+        self.files_matched = 0
+        self.probes_pending = 0
+        # 因响应超时而放弃的目录
+        self.slow_dirs = []
+        # 已入队但尚未处理完的目录
+        self.frontier = set()
+        # 已找到但尚未得到探测结果的候选文件：路径 -> 可执行文件名称
+        self.pending_candidates = {}
+        # 保存检查点的回调，接收本任务
+        self.checkpoint_callback = checkpoint_callback
+        self.last_checkpoint = time.time()
+        self.cancel_event = threading.Event()
+        # 未暂停时为置位状态
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+
+    def start(self):
+        """标记任务开始运行"""
+        with self.lock:
+            if self.state == JOB_PENDING:
+                self.state = JOB_RUNNING
+
+    def finish(self):
+        """标记任务结束（被取消的任务保持取消状态）"""
+        with self.lock:
+            if self.state != JOB_CANCELLED:
+                self.state = JOB_FINISHED
+
+    def pause(self):
+        """暂停：正在进行的目录列出和探测完成后不再开始新的工作"""
+        with self.lock:
+            if self.state != JOB_RUNNING:
+                return
+            self.state = JOB_PAUSED
+            self.resume_event.clear()
+        self.save_checkpoint()
+
+    def resume(self):
+        """继续已暂停的任务"""
+        with self.lock:
+            if self.state != JOB_PAUSED:
+                return
+            self.state = JOB_RUNNING
+            self.resume_event.set()
+
+    def cancel(self):
+        """取消任务，前沿保存为检查点供下次继续"""
+        with self.lock:
+            if self.state in (JOB_CANCELLED, JOB_FINISHED):
+                return
+            self.state = JOB_CANCELLED
+            self.cancel_event.set()
+            # 唤醒暂停中的工作线程
+            self.resume_event.set()
+
+    def is_cancelled(self):
+        """检查任务是否已取消"""
+        return self.cancel_event.is_set()
+
+    def wait_if_paused(self):
+        """暂停期间阻塞，直到继续或取消"""
+        self.resume_event.wait()
+
+    def get_progress(self):
+        """获取进度
+
+        Returns:
+            dict: {state, dirs_visited, files_matched, probes_pending, frontier, slow_dirs}
+        """
+        with self.lock:
+            return {
+                'state': self.state,
+                'dirs_visited': self.dirs_visited,
+                'files_matched': self.files_matched,
+                'probes_pending': self.probes_pending,
+                'frontier': len(self.frontier),
+                'slow_dirs': list(self.slow_dirs)
+            }
+
+    def get_checkpoint(self):
+        """获取遍历前沿的快照
+
+        Returns:
+            dict: {frontier: 目录列表, candidates: [[可执行文件名称, 路径], ...]}
+        """
+        with self.lock:
+            return {
+                'frontier': sorted(self.frontier),
+                'candidates': [[exe_name, path] for path, exe_name in self.pending_candidates.items()]
+            }
+
+    def save_checkpoint(self):
+        """通过回调保存检查点"""
+        self.last_checkpoint = time.time()
+        if self.checkpoint_callback:
+            try:
+                self.checkpoint_callback(self)
+            except:
+                pass
+
+    # 以下方法由目录遍历和版本探测调用
+
+    def dir_queued(self, directory):
+        """目录已入队"""
+        with self.lock:
+            self.frontier.add(directory)
+
+    def dir_done(self, directory):
+        """目录已处理完（子目录已入队，匹配文件已产出）"""
+        with self.lock:
+            self.frontier.discard(directory)
+            self.dirs_visited += 1
+            checkpoint_due = time.time() - self.last_checkpoint >= CHECKPOINT_INTERVAL
+            if checkpoint_due:
+                # 避免多个工作线程同时保存
+                self.last_checkpoint = time.time()
+        if checkpoint_due:
+            self.save_checkpoint()
+
+    def dir_timed_out(self, directory):
+        """目录在截止时间内没有响应，已放弃（不留在遍历前沿中）"""
+        with self.lock:
+            self.frontier.discard(directory)
+            self.slow_dirs.append(directory)
+
+    def file_matched(self, exe_name, path):
+        """找到候选文件"""
+        with self.lock:
+            self.files_matched += 1
+            self.pending_candidates[path] = exe_name
+
+    def candidate_done(self, path):
+        """候选文件已得到结果（缓存命中、探测完成或文件已不存在）"""
+        with self.lock:
+            self.pending_candidates.pop(path, None)
+
+    def probe_submitted(self):
+        """提交了一次探测"""
+        with self.lock:
+            self.probes_pending += 1
+
+    def probe_finished(self, path):
+        """一次探测已完成"""
+        with self.lock:
+            self.probes_pending -= 1
+            self.pending_candidates.pop(path, None)
+
+    def probe_cancelled(self):
+        """一次探测因任务取消而没有执行，候选文件留在检查点中"""
+        with self.lock:
+            self.probes_pending -= 1
@@ -2,376 +2,1836 @@
 """软件版本扫描模块"""
 
 import os
-import re
-import subprocess
 import threading
 import time
 import json
+import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from modules import inventory_db
+from modules.dir_priority import get_hit_dirs, make_priority
+from modules.dir_rules import (
+    DEFAULT_EXCLUDE_RULES,
+    is_barren_skipped,
+    match_rules,
+    update_barren_stats,
+)
+from modules.exe_header import header_matches_tool, preflight_check, read_exe_header
+from modules.file_lock import FileLock
+from modules.install_roots import get_install_dirs
+from modules.locate_db import get_locate_candidates
+from modules.mounts import get_scan_mounts
+from modules.probe_process import run_probe
+from modules.scan_job import ScanJob
+from modules.slow_dirs import (
+    get_quarantined_dirs,
+    is_quarantined,
+    DIR_TIMEOUT,
+    map_with_deadline,
+    quarantine_dirs,
+    release_dirs,
+    run_with_deadline,
+)
+from modules.tools import TOOL_SPECS
+from modules.walker import mark_subtree_hits, parallel_walk
 
 
+logger = logging.getLogger(__name__)
+
 # 缓存文件路径
 CACHE_FILE = os.path.join(tempfile.gettempdir(), "software_scan_cache.json")
-CACHE_DURATION = 3600  # 缓存有效期（秒）
+# 缓存格式版本，格式不兼容时递增
+CACHE_VERSION = 2
+# 扫描日志超过该大小（字节）时压缩进缓存快照
+JOURNAL_COMPACT_SIZE = 256 * 1024
+
+# 缓存存储方式：json为单个JSON文件加扫描日志，sqlite为每个安装一行的SQLite数据库
+# （见modules/inventory_db.py），sqlite3不可用时自动使用json
+INVENTORY_BACKEND = 'json'
+FULL_SCAN_INTERVAL = 3600  # 全盘扫描间隔（秒）
+FULL_SCAN_RETRY_INTERVAL = 300  # 全盘扫描未完成时的重试间隔（秒）
+
+# 缓存状态
+CACHE_MISSING = 'missing'  # 没有全盘扫描结果：缓存不存在、无法读取或从未完成全盘扫描
+CACHE_STALE = 'stale'  # 全盘扫描结果已超过FULL_SCAN_INTERVAL
+CACHE_PARTIAL = 'partial'  # 最近一次全盘扫描开始后没有完成
+CACHE_EMPTY = 'empty'  # 扫描结果有效，但没有找到任何软件
+CACHE_FRESH = 'fresh'  # 扫描结果有效
+
+# 全盘扫描锁文件路径，同一时间只有一个进程进行全盘扫描
+FULL_SCAN_LOCK_FILE = os.path.join(tempfile.gettempdir(), "software_scan_full.lock")
+
+# 全盘扫描目录索引文件路径
+DIR_INDEX_FILE = os.path.join(tempfile.gettempdir(), "software_scan_dirs.json")
+# 目录索引最长使用时间（秒），超过后重新完整遍历，以发现深层目录中的变化
+DIR_INDEX_MAX_AGE = 7 * 24 * 3600
+
+# 全盘扫描检查点文件路径，记录中断时的遍历前沿
+SCAN_CHECKPOINT_FILE = os.path.join(tempfile.gettempdir(), "software_scan_checkpoint.json")
+# 检查点最长使用时间（秒），超过后从根目录重新开始
+SCAN_CHECKPOINT_MAX_AGE = 24 * 3600
+
+# 慢目录隔离表：stat/scandir超时的目录在退避时间内不再访问
+QUARANTINE_FILE = os.path.join(tempfile.gettempdir(), "software_scan_quarantine.json")
+
+# 版本探测的最大并发数
+PROBE_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 要扫描的可执行文件，来自软件目录
+EXECUTABLES = {exe_name: spec.software for exe_name, spec in TOOL_SPECS.items()}
+
+# 可执行文件名 -> 可执行文件名称，全盘扫描时用一次查找完成匹配
+EXECUTABLE_FILE_NAMES = {}
+for _exe_name in EXECUTABLES:
+    EXECUTABLE_FILE_NAMES[_exe_name] = _exe_name
+    EXECUTABLE_FILE_NAMES[f"{_exe_name}.exe"] = _exe_name
+
+# 全盘扫描时跳过的系统目录
+SKIP_DIRS = {'Windows', 'System32', 'Program Files', 'Program Files (x86)', '$Recycle.Bin'}
+# 不跳过的隐藏目录（IDE和版本管理器的安装目录）
+HIDDEN_INSTALL_DIRS = {'.jdks', '.nvm', '.pyenv', '.sdkman', '.asdf', '.volta', '.rbenv', '.cargo', '.rustup'}
+# 全盘扫描的包含/排除规则（fnmatch通配符，含路径分隔符时匹配完整路径，否则匹配目录名），
+# 包含规则优先于排除规则、SKIP_DIRS和学习得到的贫瘠目录
+SCAN_INCLUDE_RULES = []
+SCAN_EXCLUDE_RULES = list(DEFAULT_EXCLUDE_RULES)
+# 贫瘠目录统计：连续多次全盘扫描都没有找到可执行文件的大子树
+DIR_STATS_FILE = os.path.join(tempfile.gettempdir(), "software_scan_dir_stats.json")
+
+# 全盘扫描是否包括网络文件系统（NFS、SMB等）和网络驱动器
+FULL_SCAN_INCLUDE_NETWORK = False
+# 全盘扫描是否只遍历根目录所在的文件系统（不进入st_dev不同的目录，类似find -xdev）
+FULL_SCAN_ONE_FILESYSTEM = False
+# 全盘扫描的时间预算（秒），到期后返回已找到的结果，剩余目录留到下次继续；None为不限制
+FULL_SCAN_TIME_BUDGET = None
+# 全盘扫描是否优先使用系统的locate数据库（mlocate/plocate），数据库不可用时遍历磁盘
+FULL_SCAN_USE_LOCATE = True
+
+# 分层发现的层级
+TIER_PATH = 'path'  # PATH中的可执行文件和缓存中已知的可执行文件
+TIER_INSTALL_DIRS = 'install_dirs'  # 常见安装目录和版本管理器目录
+TIER_FULL_DISK = 'full_disk'  # 全盘扫描，只在明确要求时进行
+
+# 探测状态
+PROBE_OK = 'ok'
+PROBE_FAILED = 'failed'
+PROBE_TIMEOUT = 'timeout'
+# 未通过文件头预检查，没有启动子进程
+PROBE_REJECTED = 'rejected'
 
 # 全局变量
 full_scan_running = False
 full_scan_results = {}
+revalidate_running = False
+# 保护full_scan_running，并在全盘扫描结束时通知等待的调用者
+full_scan_condition = threading.Condition()
+# 最近一次全盘扫描任务
+full_scan_job = None
+
+
+def stat_fingerprint(stat_result):
+    """由stat结果生成文件指纹
+
+    指纹由文件大小、修改时间、inode（Windows下为文件ID）和权限位组成，
+    任一项变化即认为文件已变更，需要重新探测；包含st_mode，
+    chmod +x等权限变化会使未通过预检查的负缓存失效。
+
+    Returns:
+        list: [大小, 修改时间(纳秒), inode, st_mode]
+    """
+    return [stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino, stat_result.st_mode]
+
+
+def get_file_id(exe_name, exe_path, stat_result):
+    """获取可执行文件的物理文件标识
+    
+    os.stat会解析符号链接和目录联接，同一个物理文件经由不同的PATH目录、
+    符号链接或硬链接访问时得到相同的设备号和inode（Windows下为卷序列号和文件ID）。
+    文件系统不提供inode时退化为按路径区分。
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+        stat_result (os.stat_result): 可执行文件的stat结果
+    
+    Returns:
+        tuple: 物理文件标识
+    """
+    if stat_result.st_ino:
+        return exe_name, stat_result.st_dev, stat_result.st_ino
+    return exe_name, os.path.normcase(os.path.abspath(exe_path))
+
+
+def use_inventory_db():
+    """检查是否使用SQLite存储缓存"""
+    return INVENTORY_BACKEND == 'sqlite' and inventory_db.is_available()
 
 
-def load_cache():
-    """加载缓存"""
+def get_cache_lock():
+    """获取保护缓存文件读-改-写过程的跨进程锁"""
+    return FileLock(f"{CACHE_FILE}.lock")
+
+
+def get_journal_file():
+    """获取扫描日志文件路径
+    
+    扫描日志是缓存快照之后追加的条目，每行一条JSON记录：
+    {"path": 路径, "entry": 缓存条目}。读取缓存时在快照之上按顺序重放。
+    """
+    return f"{CACHE_FILE}.journal"
+
+
+def write_json_atomic(path, data, **kwargs):
+    """原子地写入JSON文件
+    
+    先写入同目录下的临时文件，再用os.replace替换目标文件，
+    读取方只会看到旧文件或完整的新文件。
+    
+    Args:
+        path (str): 目标文件路径
+        data: 要写入的数据
+        **kwargs: 传给json.dump的参数
+    """
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.", suffix='.tmp', dir=os.path.dirname(path) or '.'
+    )
     try:
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            # 检查缓存是否过期
-            if time.time() - cache_data.get('timestamp', 0) < CACHE_DURATION:
-                return cache_data.get('results', {})
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        # Windows下目标文件正被其他进程读取时替换会失败，稍后重试
+        for attempt in range(10):
+            try:
+                os.replace(temp_path, path)
+                return
+            except PermissionError:
+                if attempt == 9:
+                    raise
+                time.sleep(0.05)
     except:
-        pass
-    return {}
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
 
-def save_cache(results):
-    """保存缓存"""
-    try:
-        cache_data = {
-            'timestamp': time.time(),
-            'results': results
+def migrate_cache(cache_data):
+    """将旧格式的缓存升级为当前格式
+    
+    版本1没有version字段，条目中可能没有arch和status，读取时按默认值处理即可；
+    版本高于CACHE_VERSION的缓存来自更新的程序，无法识别，按缓存不存在处理。
+    
+    Args:
+        cache_data (dict): 缓存文件原始内容
+    
+    Returns:
+        dict: 当前格式的缓存内容
+    """
+    if not isinstance(cache_data, dict):
+        return {}
+    version = cache_data.get('version', 1)
+    if version > CACHE_VERSION:
+        return {}
+    if version < CACHE_VERSION:
+        cache_data = dict(cache_data, version=CACHE_VERSION)
+        cache_data['entries'] = {
+            path: dict(entry, arch=entry.get('arch'), status=entry.get('status', PROBE_OK))
+            for path, entry in cache_data.get('entries', {}).items()
         }
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
-    except:
-        pass
+    return cache_data
 
 
-def scan_software_versions():
-    """扫描系统中已安装的软件版本
+def replay_journal(entries):
+    """在缓存条目上重放扫描日志
+    
+    进程崩溃时最后一行可能只写了一半，无法解析的行直接忽略。
+    
+    Args:
+        entries (dict): 可执行文件路径 -> 缓存条目，原地更新
     
     Returns:
-        dict: 软件名称 -> {版本号 -> 安装路径}
+        bool: 是否存在扫描日志记录
     """
-    # 尝试加载缓存
-    cached_results = load_cache()
-    if cached_results:
-        return cached_results
+    replayed = False
+    try:
+        with open(get_journal_file(), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    entries[record['path']] = record['entry']
+                    replayed = True
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        pass
+    return replayed
+
+
+def read_cache_file():
+    """读取JSON缓存内容（缓存快照加上扫描日志，已升级为当前格式）"""
+    cache_data = {}
+    try:
+        if os.path.exists(CACHE_FILE):
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache_data = migrate_cache(json.load(f))
+    except:
+        cache_data = {}
     
-    software_versions = {}
+    entries = dict(cache_data.get('entries', {}))
+    if replay_journal(entries) or cache_data:
+        cache_data['entries'] = entries
+    return cache_data
+
+
+def read_cache_meta():
+    """读取判断缓存状态所需的信息
     
-    # 扫描常见软件
-    software_versions.update(scan_python_versions())
-    software_versions.update(scan_node_versions())
-    software_versions.update(scan_java_versions())
-    software_versions.update(scan_git_versions())
+    使用SQLite存储时只读取元数据和安装数，不读取条目本身。
     
-    # 保存缓存
-    save_cache(software_versions)
+    Returns:
+        dict: {full_scan_timestamp, full_scan_started, installations: 探测成功的安装数}，
+            缓存不存在时返回空字典
+    """
+    if use_inventory_db():
+        try:
+            cache_meta = inventory_db.load_meta()
+            installations = inventory_db.count_installations()
+        except Exception:
+            logger.exception("读取软件清单数据库失败")
+            return {}
+        if not cache_meta and not installations:
+            return {}
+        return dict(cache_meta, installations=installations)
     
-    # 启动异步全盘扫描
-    start_full_scan()
+    cache_data = read_cache_file()
+    if not isinstance(cache_data.get('entries'), dict):
+        return {}
+    return {
+        'full_scan_timestamp': cache_data.get('full_scan_timestamp', 0),
+        'full_scan_started': cache_data.get('full_scan_started', 0),
+        'installations': sum(len(versions) for versions in build_results(cache_data['entries']).values())
+    }
+
+
+def open_cache_view():
+    """获取扫描时查询缓存条目用的对象
     
-    return software_versions
+    使用SQLite存储时为按路径查询的inventory_db.CacheView，否则为全部缓存条目，
+    用完后交给close_cache_view()。
+    """
+    if use_inventory_db():
+        return inventory_db.CacheView()
+    return load_cache()
 
 
-def find_executable(name):
-    """查找可执行文件路径
+def close_cache_view(cache):
+    """关闭open_cache_view()打开的数据库连接"""
+    if isinstance(cache, inventory_db.CacheView):
+        cache.close()
+
+
+def load_cache(exe_name=None):
+    """加载缓存
     
     Args:
-        name (str): 可执行文件名称
+        exe_name (str): 只加载该可执行文件的条目，为None时加载全部
     
     Returns:
-        list: 可执行文件路径列表
+        dict: 可执行文件路径 -> {exe_name, fingerprint, version, arch, status}，
+            status不为ok的条目是负缓存，version为None
+    """
+    if use_inventory_db():
+        try:
+            return inventory_db.load_entries(exe_name)
+        except Exception:
+            logger.exception("读取软件清单数据库失败")
+            return {}
+    entries = read_cache_file().get('entries', {})
+    if exe_name is None:
+        return entries
+    return {path: entry for path, entry in entries.items() if entry.get('exe_name') == exe_name}
+
+
+def write_cache_file(entries, full_scan_timestamp, full_scan_started):
+    """写入缓存快照并清空扫描日志，调用方需持有缓存锁
+    
+    快照已包含日志中的全部条目；替换快照后、清空日志前崩溃时，
+    日志会在快照上再重放一次，结果不变。
     """
-    paths = []
+    cache_data = {
+        'version': CACHE_VERSION,
+        'timestamp': time.time(),
+        'full_scan_timestamp': full_scan_timestamp,
+        'full_scan_started': full_scan_started,
+        'entries': entries
+    }
+    write_json_atomic(CACHE_FILE, cache_data, separators=(',', ':'))
+    try:
+        os.remove(get_journal_file())
+    except OSError:
+        pass
+
+
+def compact_journal():
+    """将扫描日志压缩进缓存快照，调用方需持有缓存锁"""
+    cache_data = read_cache_file()
+    write_cache_file(
+        cache_data.get('entries', {}),
+        cache_data.get('full_scan_timestamp', 0),
+        cache_data.get('full_scan_started', 0)
+    )
+
+
+def open_journal_writer():
+    """打开一次扫描共用的SQLite写入连接，使用JSON缓存时返回None"""
+    if use_inventory_db():
+        return inventory_db.EntryWriter(EXECUTABLES)
+    return None
+
+
+def append_journal(path, entry, writer=None):
+    """向扫描日志追加一条缓存条目
     
-    # 从系统PATH环境变量中查找
-    path_env = os.environ.get('PATH', '')
-    for path in path_env.split(';'):
-        if path.strip():
-            exe_path = os.path.join(path, name)
-            if os.path.exists(exe_path):
-                paths.append(exe_path)
-            # 检查带.exe扩展名的版本
-            exe_path_exe = f"{exe_path}.exe"
-            if os.path.exists(exe_path_exe):
-                paths.append(exe_path_exe)
+    每条记录只追加一行，开销与缓存大小无关；
+    日志超过JOURNAL_COMPACT_SIZE时压缩进缓存快照。
     
-    # 去重并返回
-    return list(set(paths))
+    Args:
+        path (str): 可执行文件路径
+        entry (dict): 缓存条目
+        writer (inventory_db.EntryWriter): open_journal_writer()的返回值，
+            使用SQLite存储时在这个连接上写入
+    """
+    if use_inventory_db():
+        try:
+            if writer:
+                writer.write(path, entry)
+            else:
+                inventory_db.merge_entries({path: entry}, EXECUTABLES)
+        except Exception:
+            logger.exception("写入软件清单数据库失败: %s", path)
+        return
+    
+    line = json.dumps({'path': path, 'entry': entry}, ensure_ascii=False, separators=(',', ':'))
+    try:
+        with get_cache_lock():
+            with open(get_journal_file(), 'a', encoding='utf-8') as f:
+                f.write(f"{line}\n")
+                journal_size = f.tell()
+            if journal_size >= JOURNAL_COMPACT_SIZE:
+                compact_journal()
+    except:
+        pass
 
 
-def scan_python_versions():
-    """扫描Python版本"""
-    versions = {}
+def merge_cache(scan_entries, full_scan_timestamp=None, removed_paths=(), full_scan_started=None):
+    """将扫描结果按条目合并到缓存
+    
+    在缓存锁内重新读取缓存文件再合并，只改动本次扫描探测过的路径和确认已删除的路径，
+    其他扫描（如后台全盘扫描）同时写入的条目不会丢失，也就不需要重新探测。
+    
+    Args:
+        scan_entries (dict): 可执行文件路径 -> 缓存条目
+        full_scan_timestamp (float): 全盘扫描完成时间，为None时沿用原值
+        removed_paths (iterable): 已不存在或已不再支持的可执行文件路径
+        full_scan_started (float): 全盘扫描开始时间，为None时沿用原值
+    """
+    removed_paths = list(removed_paths)
+    if not scan_entries and not removed_paths and full_scan_timestamp is None and full_scan_started is None:
+        return
     
+    if use_inventory_db():
+        # 写入失败时整批条目丢失，记录日志而不是静默忽略
+        try:
+            inventory_db.merge_entries(scan_entries, EXECUTABLES, removed_paths, meta={
+                'timestamp': time.time(),
+                'full_scan_timestamp': full_scan_timestamp,
+                'full_scan_started': full_scan_started
+            })
+        except Exception:
+            logger.exception("写入软件清单数据库失败（%d个条目）", len(scan_entries))
+        return
     try:
-        # 使用Python的方式查找Python可执行文件
-        python_paths = find_executable("python")
-        
-        for path in python_paths:
-            if os.path.exists(path):
-                # 获取Python版本
-                try:
-                    version_result = subprocess.run(
-                        [path, "--version"], 
-                        capture_output=True, 
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    if version_result.returncode == 0:
-                        version_match = re.search(r"Python (\d+\.\d+\.\d+)", version_result.stderr)
-                        if version_match:
-                            version = version_match.group(1)
-                            versions[version] = path
-                except:
-                    pass
+        with get_cache_lock():
+            cache_data = read_cache_file()
+            current_entries = cache_data.get('entries', {})
+            for path in removed_paths:
+                current_entries.pop(path, None)
+            current_entries.update(scan_entries)
+            
+            if full_scan_timestamp is None:
+                full_scan_timestamp = cache_data.get('full_scan_timestamp', 0)
+            if full_scan_started is None:
+                full_scan_started = cache_data.get('full_scan_started', 0)
+            write_cache_file(current_entries, full_scan_timestamp, full_scan_started)
     except:
         pass
+
+
+def get_removed_paths(cache, entries):
+    """获取缓存中有、本次扫描中已不存在的路径
+    
+    Args:
+        cache (dict): 扫描开始时加载的缓存条目，或open_cache_view()的返回值
+        entries (dict): 本次扫描得到的条目
     
-    return {"Python": versions}
+    Returns:
+        list: 应从缓存中移除的路径
+    """
+    return [path for path in cache if path not in entries]
 
 
-def scan_node_versions():
-    """扫描Node.js版本"""
-    versions = {}
+def load_dir_index():
+    """加载全盘扫描目录索引
     
+    Returns:
+        dict: 目录路径 -> [mtime, 子树是否命中, 子目录名列表, 匹配文件列表]，
+            索引不存在或已超过DIR_INDEX_MAX_AGE时返回空字典
+    """
     try:
-        # 使用Python的方式查找Node.js可执行文件
-        node_paths = find_executable("node")
-        
-        for path in node_paths:
-            if os.path.exists(path):
-                # 获取Node.js版本
-                try:
-                    version_result = subprocess.run(
-                        [path, "--version"], 
-                        capture_output=True, 
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    if version_result.returncode == 0:
-                        version = version_result.stdout.strip().lstrip('v')
-                        versions[version] = path
-                except:
-                    pass
+        if os.path.exists(DIR_INDEX_FILE):
+            with open(DIR_INDEX_FILE, 'r', encoding='utf-8') as f:
+                index_data = json.load(f)
+            if time.time() - index_data.get('timestamp', 0) < DIR_INDEX_MAX_AGE:
+                return index_data.get('dirs', {})
     except:
         pass
+    return {}
+
+
+def save_dir_index(index, timestamp=None):
+    """保存全盘扫描目录索引
     
-    return {"Node.js": versions}
+    Args:
+        index (dict): 目录路径 -> 索引条目
+        timestamp (float): 索引完整建立的时间，为None时沿用原值
+    """
+    try:
+        if timestamp is None:
+            with open(DIR_INDEX_FILE, 'r', encoding='utf-8') as f:
+                timestamp = json.load(f).get('timestamp', 0)
+    except:
+        timestamp = 0
+    try:
+        index_data = {
+            'timestamp': timestamp,
+            'dirs': index
+        }
+        write_json_atomic(DIR_INDEX_FILE, index_data, separators=(',', ':'))
+    except:
+        pass
 
 
-def scan_java_versions():
-    """扫描Java版本"""
-    versions = {}
+def load_dir_stats():
+    """加载贫瘠目录统计
     
+    Returns:
+        dict: {scans: 已完成的全盘扫描次数, dirs: 目录 -> [连续贫瘠次数, 子树目录数]}
+    """
     try:
-        # 使用Python的方式查找Java可执行文件
-        java_paths = find_executable("java")
-        
-        for path in java_paths:
-            if os.path.exists(path):
-                # 获取Java版本
-                try:
-                    version_result = subprocess.run(
-                        [path, "-version"], 
-                        capture_output=True, 
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    if version_result.returncode == 0:
-                        version_match = re.search(r'version "(\d+\.\d+\.\d+.*?)"', version_result.stderr)
-                        if version_match:
-                            version = version_match.group(1)
-                            versions[version] = path
-                except:
-                    pass
+        if os.path.exists(DIR_STATS_FILE):
+            with open(DIR_STATS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
     except:
         pass
+    return {}
+
+
+def save_dir_stats(index, partial=False):
+    """根据一次完整的全盘扫描更新并保存贫瘠目录统计
     
-    return {"Java": versions}
+    Args:
+        index (dict): 本次遍历的目录索引（子树命中标记已计算）
+        partial (bool): 索引只覆盖部分磁盘，见update_barren_stats()
+    """
+    try:
+        stats = update_barren_stats(load_dir_stats(), index, partial)
+        write_json_atomic(DIR_STATS_FILE, stats, separators=(',', ':'))
+    except:
+        pass
 
 
-def scan_git_versions():
-    """扫描Git版本"""
-    versions = {}
+def load_quarantine():
+    """加载慢目录隔离表
     
+    Returns:
+        dict: 规范化的目录 -> {path: 目录, until: 隔离截止时间, failures: 连续超时次数}
+    """
     try:
-        # 使用Python的方式查找Git可执行文件
-        git_paths = find_executable("git")
-        
-        for path in git_paths:
-            if os.path.exists(path):
-                # 获取Git版本
-                try:
-                    version_result = subprocess.run(
-                        [path, "--version"], 
-                        capture_output=True, 
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    if version_result.returncode == 0:
-                        version_match = re.search(r"git version (\d+\.\d+\.\d+.*?)", version_result.stdout)
-                        if version_match:
-                            version = version_match.group(1)
-                            versions[version] = path
-                except:
-                    pass
+        if os.path.exists(QUARANTINE_FILE):
+            with open(QUARANTINE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get('dirs', {})
     except:
         pass
+    return {}
+
+
+def update_quarantine(timed_out=(), recovered=()):
+    """更新慢目录隔离表（在缓存锁内读-改-写）
     
-    return {"Git": versions}
+    Args:
+        timed_out (iterable): 本次超时的目录，隔离时间按连续超时次数加倍
+        recovered (iterable): 曾被隔离、本次已正常响应的目录，移出隔离表
+    """
+    timed_out = list(timed_out)
+    recovered = list(recovered)
+    if not timed_out and not recovered:
+        return
+    try:
+        with get_cache_lock():
+            quarantine = load_quarantine()
+            changed = release_dirs(quarantine, recovered)
+            if timed_out:
+                quarantine_dirs(quarantine, timed_out)
+            if changed or timed_out:
+                write_json_atomic(QUARANTINE_FILE, {'dirs': quarantine})
+    except:
+        pass
 
 
-def get_all_drives():
-    """获取所有驱动器"""
-    drives = []
-    if os.name == 'nt':  # Windows系统
-        import ctypes
-        drives_bitmask = ctypes.windll.kernel32.GetLogicalDrives()
-        for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-            if drives_bitmask & 1:
-                drives.append(f"{letter}:\\")
-            drives_bitmask >>= 1
-    else:
-        # 非Windows系统，返回常见路径
-        drives = ['/']
-    return drives
+def get_slow_dirs():
+    """获取隔离期内的慢目录列表（扫描结果中报告给用户）"""
+    return get_quarantined_dirs(load_quarantine())
 
 
-def full_scan():
-    """全盘扫描软件"""
-    global full_scan_running, full_scan_results
+def mark_full_scan_started():
+    """记录全盘扫描开始时间，扫描未完成时缓存状态为CACHE_PARTIAL"""
+    merge_cache({}, full_scan_started=time.time())
+
+
+def get_cache_state(cache_meta=None):
+    """获取缓存状态
     
-    if full_scan_running:
-        return
+    空的扫描结果也是有效结果（CACHE_EMPTY），与缓存不存在（CACHE_MISSING）区分开，
+    没有安装任何软件的机器不会因此在每次刷新时重新扫描。
+    
+    Args:
+        cache_meta (dict): read_cache_meta()的返回值，为None时重新读取
+    
+    Returns:
+        str: CACHE_MISSING、CACHE_STALE、CACHE_PARTIAL、CACHE_EMPTY或CACHE_FRESH
+    """
+    if cache_meta is None:
+        cache_meta = read_cache_meta()
+    if not cache_meta:
+        return CACHE_MISSING
+    
+    full_scan_timestamp = cache_meta.get('full_scan_timestamp', 0)
+    if cache_meta.get('full_scan_started', 0) > full_scan_timestamp:
+        return CACHE_PARTIAL
+    # 缓存中只有PATH和常见安装目录的结果，不是过期的全盘扫描结果
+    if not full_scan_timestamp:
+        return CACHE_MISSING
+    if time.time() - full_scan_timestamp >= FULL_SCAN_INTERVAL:
+        return CACHE_STALE
+    if not cache_meta.get('installations'):
+        return CACHE_EMPTY
+    return CACHE_FRESH
+
+
+def save_scan_checkpoint(job):
+    """保存全盘扫描任务的遍历前沿
     
-    full_scan_running = True
-    full_scan_results = {}
+    Args:
+        job (ScanJob): 扫描任务
+    """
+    checkpoint = job.get_checkpoint()
+    checkpoint['timestamp'] = time.time()
+    write_json_atomic(SCAN_CHECKPOINT_FILE, checkpoint, separators=(',', ':'))
+
+
+def load_scan_checkpoint():
+    """加载上次中断的全盘扫描的检查点
     
+    Returns:
+        dict: {frontier, candidates, timestamp}，没有可用的检查点时返回None
+    """
     try:
-        # 获取所有驱动器
-        drives = get_all_drives()
-        
-        # 要扫描的可执行文件
-        executables = {
-            "python": "Python",
-            "node": "Node.js",
-            "java": "Java",
-            "git": "Git"
-        }
-        
-        # 扫描结果
-        scan_results = {}
-        
-        # 遍历所有驱动器
-        for drive in drives:
-            if os.path.exists(drive):
-                # 遍历驱动器中的文件
-                for root, dirs, files in os.walk(drive):
-                    # 跳过系统目录和隐藏目录
-                    dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['Windows', 'System32', 'Program Files', 'Program Files (x86)', '$Recycle.Bin']]
-                    
-                    # 检查文件
-                    for file in files:
-                        for exe_name, software_name in executables.items():
-                            if file == exe_name or file == f"{exe_name}.exe":
-                                exe_path = os.path.join(root, file)
-                                if os.path.isfile(exe_path):
-                                    # 尝试获取版本信息
-                                    version = get_version_info(exe_name, exe_path)
-                                    if version:
-                                        if software_name not in scan_results:
-                                            scan_results[software_name] = {}
-                                        scan_results[software_name][version] = exe_path
-        
-        # 更新全局结果
-        full_scan_results = scan_results
-        
-        # 如果有新结果，更新缓存
-        if scan_results:
-            # 加载现有缓存
-            current_results = load_cache()
-            # 合并结果
-            for software, versions in scan_results.items():
-                if software not in current_results:
-                    current_results[software] = {}
-                current_results[software].update(versions)
-            # 保存更新后的缓存
-            save_cache(current_results)
-            
+        with open(SCAN_CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if time.time() - checkpoint.get('timestamp', 0) < SCAN_CHECKPOINT_MAX_AGE:
+            return checkpoint
     except:
         pass
-    finally:
-        full_scan_running = False
+    return None
 
 
-def get_version_info(exe_name, exe_path):
-    """获取可执行文件版本信息
+def clear_scan_checkpoint():
+    """删除全盘扫描检查点"""
+    try:
+        os.remove(SCAN_CHECKPOINT_FILE)
+    except OSError:
+        pass
+
+
+def is_full_scan_due(cache_meta=None):
+    """检查是否需要重新进行全盘扫描
+    
+    未完成的全盘扫描按FULL_SCAN_RETRY_INTERVAL重试，而不是每次刷新都重新开始；
+    本进程中正在全盘扫描时不需要。
+    
+    Args:
+        cache_meta (dict): read_cache_meta()的返回值，为None时重新读取
+    """
+    if full_scan_running:
+        return False
+    if cache_meta is None:
+        cache_meta = read_cache_meta()
+    state = get_cache_state(cache_meta)
+    if state == CACHE_PARTIAL:
+        return time.time() - cache_meta.get('full_scan_started', 0) >= FULL_SCAN_RETRY_INTERVAL
+    return state in (CACHE_MISSING, CACHE_STALE)
+
+
+def lookup_cache(cache, exe_name, exe_path, fingerprint):
+    """查找指纹匹配的缓存条目
+    
+    使用SQLite存储时，路径没有匹配的条目再经指纹索引查找同一文件在其他路径下的条目，
+    移动或重命名过的安装目录不必重新探测。
     
     Args:
+        cache (dict): 可执行文件路径 -> 缓存条目，或open_cache_view()的返回值
         exe_name (str): 可执行文件名称
         exe_path (str): 可执行文件路径
+        fingerprint (list): 当前文件指纹
     
     Returns:
-        str: 版本号或None
+        dict: 缓存条目，未命中时返回None
     """
-    try:
-        if exe_name == "python":
-            result = subprocess.run(
-                [exe_path, "--version"], 
-                capture_output=True, 
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            if result.returncode == 0:
-                match = re.search(r"Python (\d+\.\d+\.\d+)", result.stderr)
-                if match:
-                    return match.group(1)
-        
-        elif exe_name == "node":
-            result = subprocess.run(
-                [exe_path, "--version"], 
-                capture_output=True, 
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            if result.returncode == 0:
-                return result.stdout.strip().lstrip('v')
-        
-        elif exe_name == "java":
-            result = subprocess.run(
-                [exe_path, "-version"], 
-                capture_output=True, 
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            if result.returncode == 0:
-                match = re.search(r'version "(\d+\.\d+\.\d+.*?)"', result.stderr)
-                if match:
-                    return match.group(1)
-        
-        elif exe_name == "git":
-            result = subprocess.run(
-                [exe_path, "--version"], 
-                capture_output=True, 
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            if result.returncode == 0:
-                match = re.search(r"git version (\d+\.\d+\.\d+.*?)", result.stdout)
-                if match:
-                    return match.group(1)
-    except:
-        pass
+    entry = cache.get(exe_path) if cache else None
+    if entry and entry.get('exe_name') == exe_name:
+        cached = entry.get('fingerprint')
+        if cached == fingerprint:
+            return entry
+        # 旧版本缓存的指纹不含st_mode，探测成功的条目仍然可以复用
+        if entry.get('status', PROBE_OK) == PROBE_OK and cached == fingerprint[:3]:
+            return entry
+    if isinstance(cache, inventory_db.CacheView):
+        return cache.find_fingerprint(exe_name, fingerprint)
     return None
 
 
-def start_full_scan():
-    """启动异步全盘扫描"""
-    global full_scan_running
+def make_entry(exe_name, fingerprint, version, arch=None, status=PROBE_OK):
+    """创建缓存条目
+    
+    失败、超时和未通过预检查的结果同样写入缓存（负缓存），
+    这些文件在指纹变化前不会再启动子进程探测。
+    """
+    return {
+        'exe_name': exe_name,
+        'fingerprint': fingerprint,
+        'version': version,
+        'arch': arch,
+        'status': status
+    }
+
+
+def build_results(entries):
+    """由缓存条目生成扫描结果
+    
+    Args:
+        entries (dict): 可执行文件路径 -> 缓存条目
+    
+    Returns:
+        dict: 软件名称 -> {版本号 -> 安装路径}
+    """
+    results = {}
+    for path, entry in entries.items():
+        software = EXECUTABLES.get(entry.get('exe_name'))
+        if software and entry.get('version'):
+            # 同一版本有多个路径时保留最先出现的（PATH中优先级最高的）
+            results.setdefault(software, {}).setdefault(entry['version'], path)
+    return results
+
+
+def get_cache_candidates(cache):
+    """获取缓存中已知的候选可执行文件
+    
+    Args:
+        cache (dict): 可执行文件路径 -> 缓存条目，或open_cache_view()的返回值
+    
+    Returns:
+        list: (可执行文件名称, 可执行文件路径) 列表，忽略软件目录中已不存在的软件
+    """
+    if isinstance(cache, inventory_db.CacheView):
+        known = cache.list_paths()
+    else:
+        known = [(entry.get('exe_name'), path) for path, entry in cache.items()]
+    return [(exe_name, path) for exe_name, path in known if exe_name in EXECUTABLES]
+
+
+def get_executable_archs(paths=None):
+    """获取已探测可执行文件的架构
+    
+    Args:
+        paths (iterable): 只获取这些路径的架构，为None时获取全部
+    
+    Returns:
+        dict: 可执行文件路径 -> 架构（x86/x64/arm64等，未知时为None）
+    """
+    if paths is not None and use_inventory_db():
+        try:
+            return inventory_db.query_archs(paths)
+        except:
+            return {}
+    return {path: entry.get('arch') for path, entry in load_cache().items()}
+
+
+def get_installations(software=None):
+    """获取探测成功的全部安装，同一版本的多个安装都会返回
     
-    if not full_scan_running:
-        scan_thread = threading.Thread(target=full_scan)
-        scan_thread.daemon = True
-        scan_thread.start()
+    Args:
+        software (str): 只获取该软件的安装，为None时获取全部
+    
+    Returns:
+        list: (软件名称, 版本号, 安装路径, 架构) 列表
+    """
+    if use_inventory_db():
+        try:
+            return inventory_db.query_installations(software)
+        except:
+            return []
+    installations = []
+    for path, entry in load_cache().items():
+        entry_software = EXECUTABLES.get(entry.get('exe_name'))
+        if entry_software and entry.get('version') and software in (None, entry_software):
+            installations.append((entry_software, entry['version'], path, entry.get('arch')))
+    return installations
+
+
+def iter_discovery_tiers(full_disk=False):
+    """分层发现已安装的软件版本，每完成一层产出一次累计结果
+    
+    1. PATH中的可执行文件，以及缓存中已知的可执行文件（stat校验，指纹未变化的直接复用）
+    2. 常见安装目录和版本管理器目录（见modules/install_roots.py），只列出目录不递归
+    3. 全盘扫描，只在full_disk为True时进行
+    
+    Args:
+        full_disk (bool): 是否进行第3层全盘扫描
+    
+    Yields:
+        tuple: (层级, 软件名称 -> {版本号 -> 安装路径})
+    """
+    cache = open_cache_view()
+    try:
+        # 第1层：PATH + 缓存中已知的可执行文件（包括全盘扫描结果）
+        candidates = get_path_candidates()
+        candidates.extend(get_cache_candidates(cache))
+        entries = probe_versions(candidates, cache=cache)
+        # 按条目合并到缓存，已删除的可执行文件从缓存中移除
+        merge_cache(entries, removed_paths=get_removed_paths(cache, entries))
+        yield TIER_PATH, make_software_versions(entries)
+        
+        # 第2层：常见安装目录
+        candidates = [
+            candidate for candidate in get_install_dir_candidates()
+            if candidate[1] not in entries
+        ]
+        install_entries = probe_versions(candidates, cache=cache)
+        merge_cache(install_entries)
+        entries.update(install_entries)
+        yield TIER_INSTALL_DIRS, make_software_versions(entries)
+    finally:
+        close_cache_view(cache)
+    
+    # 第3层：全盘扫描（已有全盘扫描在进行时等待其结果）
+    if full_disk:
+        full_scan()
+        yield TIER_FULL_DISK, load_software_versions()
+
+
+def make_software_versions(entries):
+    """由缓存条目生成包含全部软件的扫描结果"""
+    software_versions = {software: {} for software in EXECUTABLES.values()}
+    for software, versions in build_results(entries).items():
+        software_versions[software].update(versions)
+    return software_versions
+
+
+def scan_software_versions(full_disk=False):
+    """扫描系统中已安装的软件版本
+    
+    依次完成分层发现的各层（见iter_discovery_tiers()），返回最后一层的结果。
+    每次都会重新发现PATH和常见安装目录中的可执行文件，并对缓存中的条目做一次stat校验：
+    指纹未变化的直接复用缓存版本，变化的重新探测，已删除的从缓存中移除。
+    
+    Args:
+        full_disk (bool): 是否同时进行全盘扫描
+    
+    Returns:
+        dict: 软件名称 -> {版本号 -> 安装路径}
+    """
+    software_versions = {}
+    for _, software_versions in iter_discovery_tiers(full_disk):
+        pass
+    return software_versions
+
+
+def load_software_versions():
+    """读取上次扫描得到的软件版本，不访问文件系统中的可执行文件
+    
+    用于先显示已知结果，再由start_revalidate()在后台刷新。
+    
+    Returns:
+        dict: 软件名称 -> {版本号 -> 安装路径}，缓存不存在时各软件均为空
+    """
+    software_versions = {software: {} for software in EXECUTABLES.values()}
+    for software, version, path, _ in get_installations():
+        if software in software_versions:
+            software_versions[software].setdefault(version, path)
+    return software_versions
+
+
+def diff_software_versions(old_versions, new_versions):
+    """比较两次扫描结果
+    
+    Args:
+        old_versions (dict): 软件名称 -> {版本号 -> 安装路径}
+        new_versions (dict): 软件名称 -> {版本号 -> 安装路径}
+    
+    Returns:
+        dict: {'added': ..., 'removed': ..., 'changed': ...}，
+            每项均为 软件名称 -> {版本号 -> 安装路径}；
+            changed为版本号不变但安装路径变化的条目，路径取新值
+    """
+    delta = {'added': {}, 'removed': {}, 'changed': {}}
+    for software in set(old_versions) | set(new_versions):
+        old = old_versions.get(software, {})
+        new = new_versions.get(software, {})
+        for version, path in new.items():
+            if version not in old:
+                delta['added'].setdefault(software, {})[version] = path
+            elif old[version] != path:
+                delta['changed'].setdefault(software, {})[version] = path
+        for version, path in old.items():
+            if version not in new:
+                delta['removed'].setdefault(software, {})[version] = path
+    return delta
+
+
+def revalidate(stale_versions, callback, full_disk=False, get_path_env=None):
+    """重新扫描软件版本，每完成一层发现就将与上次结果的差异交给回调函数
+    
+    启用的版本（需要列出PATH目录）和架构（需要读取缓存）也在扫描线程中计算，
+    随差异一起交给回调函数，界面线程不访问文件系统。
+    
+    Args:
+        stale_versions (dict): 已经显示的软件版本
+        callback (callable): 接收 (新的软件版本, 差异)，在扫描线程中调用。差异中另有：
+            enabled为软件名称 -> 启用的版本号，archs为安装路径 -> 架构，
+            cache_state为缓存状态（get_cache_state()），full_scan_due为是否需要全盘扫描，
+            slow_dirs为因响应缓慢而被隔离的目录
+        full_disk (bool): 是否进行全盘扫描
+        get_path_env (callable): 返回最新PATH值的函数，每次回调前调用，默认使用当前进程的PATH
+    """
+    global revalidate_running
+    
+    try:
+        published_versions = stale_versions
+        for _, software_versions in iter_discovery_tiers(full_disk):
+            delta = diff_software_versions(published_versions, software_versions)
+            delta['enabled'] = find_enabled_versions(
+                software_versions, get_path_env() if get_path_env else None
+            )
+            delta['archs'] = get_executable_archs([
+                path for versions in software_versions.values() for path in versions.values()
+            ])
+            cache_meta = read_cache_meta()
+            delta['cache_state'] = get_cache_state(cache_meta)
+            delta['full_scan_due'] = is_full_scan_due(cache_meta)
+            # 因响应缓慢而跳过的目录
+            delta['slow_dirs'] = get_slow_dirs()
+            callback(software_versions, delta)
+            published_versions = software_versions
+    except:
+        pass
+    finally:
+        revalidate_running = False
+
+
+def start_revalidate(stale_versions, callback, full_disk=False, get_path_env=None):
+    """启动后台刷新
+    
+    Args:
+        stale_versions (dict): 已经显示的软件版本
+        callback (callable): 接收 (新的软件版本, 差异)，在扫描线程中调用
+        full_disk (bool): 是否进行全盘扫描
+        get_path_env (callable): 见revalidate()
+    
+    Returns:
+        bool: 是否启动了新的刷新，已有刷新在进行时返回False
+    """
+    global revalidate_running
+    
+    if revalidate_running:
+        return False
+    revalidate_running = True
+    revalidate_thread = threading.Thread(
+        target=revalidate, args=(stale_versions, callback, full_disk, get_path_env)
+    )
+    revalidate_thread.daemon = True
+    revalidate_thread.start()
+    return True
+
+
+def get_path_dirs(path_env=None):
+    """获取PATH中的目录列表
+    
+    按os.pathsep分隔，展开其中的环境变量（注册表中的PATH为REG_EXPAND_SZ），
+    去掉空项和重复项并保持原有顺序。
+    
+    Args:
+        path_env (str): PATH的值，默认为当前进程的PATH环境变量
+    
+    Returns:
+        list: 目录列表
+    """
+    if path_env is None:
+        path_env = os.environ.get('PATH', '')
+    
+    path_dirs = []
+    seen = set()
+    for path in path_env.split(os.pathsep):
+        path = os.path.expandvars(path.strip().strip('"'))
+        if not path:
+            continue
+        key = os.path.normcase(os.path.normpath(path))
+        if key not in seen:
+            seen.add(key)
+            path_dirs.append(path)
+    return path_dirs
+
+
+def get_path_extensions():
+    """获取可执行文件扩展名列表（不含空扩展名，小写）"""
+    extensions = ['.exe']
+    for ext in os.environ.get('PATHEXT', '').split(os.pathsep):
+        ext = ext.strip().lower()
+        if ext and ext not in extensions:
+            extensions.append(ext)
+    return extensions
+
+
+def index_directories(directories):
+    """列出目录，查找其中所有软件的可执行文件（不递归）
+    
+    每个目录只用scandir列出一次，所有软件的可执行文件名
+    及其PATHEXT扩展名变体都从这一次列出的结果中查找。
+    各目录并行列出并共用一个截止时间，失效的网络共享不会阻塞启动；
+    超时的目录记入隔离表，隔离期内直接跳过。
+    
+    Args:
+        directories (list): 目录列表
+    
+    Returns:
+        dict: 可执行文件名称 -> 可执行文件路径列表（按目录顺序排列）
+    """
+    fold_case = os.name == 'nt'
+    
+    # 文件名 -> 可执行文件名称
+    file_names = {}
+    for exe_name in EXECUTABLES:
+        file_names[exe_name] = exe_name
+        for ext in get_path_extensions():
+            file_names[f"{exe_name}{ext}"] = exe_name
+    
+    def list_executables(directory):
+        found = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                exe_name = file_names.get(entry.name.lower() if fold_case else entry.name)
+                if exe_name and entry.is_file():
+                    found.append((exe_name, entry.path))
+        return found
+    
+    quarantine = load_quarantine()
+    directories = [directory for directory in directories if not is_quarantined(quarantine, directory)]
+    
+    dir_index = {exe_name: [] for exe_name in EXECUTABLES}
+    timed_out = []
+    recovered = []
+    for directory, found, error in map_with_deadline(list_executables, directories):
+        if isinstance(error, TimeoutError):
+            timed_out.append(directory)
+            continue
+        if quarantine:
+            recovered.append(directory)
+        for exe_name, path in found or []:
+            dir_index[exe_name].append(path)
+    update_quarantine(timed_out, recovered)
+    return dir_index
+
+
+def build_path_index(path_env=None):
+    """建立PATH目录索引
+    
+    Args:
+        path_env (str): PATH的值，默认为当前进程的PATH环境变量
+    
+    Returns:
+        dict: 可执行文件名称 -> 可执行文件路径列表（按PATH优先级排序）
+    """
+    return index_directories(get_path_dirs(path_env))
+
+
+def get_install_dir_candidates():
+    """获取常见安装目录中所有软件的候选可执行文件
+    
+    Returns:
+        list: (可执行文件名称, 可执行文件路径) 列表
+    """
+    return get_path_candidates(index_directories(get_install_dirs()))
+
+
+def get_path_candidates(path_index=None):
+    """获取PATH中所有软件的候选可执行文件
+    
+    Args:
+        path_index (dict): build_path_index()的返回值，为None时重新建立
+    
+    Returns:
+        list: (可执行文件名称, 可执行文件路径) 列表
+    """
+    if path_index is None:
+        path_index = build_path_index()
+    return [
+        (exe_name, path)
+        for exe_name, paths in path_index.items()
+        for path in paths
+    ]
+
+
+def find_executable(name):
+    """查找可执行文件路径
+    
+    Args:
+        name (str): 可执行文件名称
+    
+    Returns:
+        list: 可执行文件路径列表（按PATH优先级排序）
+    """
+    return build_path_index().get(name, [])
+
+
+def find_enabled_versions(software_versions, path_env=None):
+    """查找当前PATH中生效的软件版本
+    
+    每个软件在PATH中排在最前面的可执行文件即为生效的版本。
+    
+    Args:
+        software_versions (dict): 软件名称 -> {版本号 -> 安装路径}
+        path_env (str): PATH的值，默认为当前进程的PATH环境变量
+    
+    Returns:
+        dict: 软件名称 -> 生效的版本号
+    """
+    path_index = build_path_index(path_env)
+    enabled_versions = {}
+    
+    for exe_name, software in EXECUTABLES.items():
+        active_paths = path_index.get(exe_name)
+        if not active_paths:
+            continue
+        active_dir = os.path.normcase(os.path.dirname(active_paths[0]))
+        for version, path in software_versions.get(software, {}).items():
+            if os.path.normcase(os.path.dirname(path)) == active_dir:
+                enabled_versions[software] = version
+                break
+    
+    return enabled_versions
+
+
+class DirDeadlines:
+    """一次探测中各目录的响应状态，见stat_candidate()"""
+    def __init__(self, quarantine=None):
+        # 慢目录隔离表，为None时重新加载
+        self.quarantine = load_quarantine() if quarantine is None else quarantine
+        # 已确认能正常响应的目录
+        self.responsive_dirs = set()
+        # 本次超时的目录，探测结束后记入隔离表
+        self.timed_out = []
+
+
+def stat_candidate(exe_path, deadlines):
+    """stat候选可执行文件，每个目录的第一次stat带截止时间
+    
+    Args:
+        exe_path (str): 可执行文件路径
+        deadlines (DirDeadlines): 本次探测的目录响应状态，原地更新
+    
+    Returns:
+        os.stat_result: stat结果
+    
+    Raises:
+        TimeoutError: 目录已隔离或本次超时
+        OSError: 文件不存在等
+    """
+    directory = os.path.dirname(exe_path)
+    if directory in deadlines.responsive_dirs:
+        return os.stat(exe_path)
+    if directory in deadlines.timed_out or is_quarantined(deadlines.quarantine, directory):
+        raise TimeoutError(directory)
+    try:
+        stat_result = run_with_deadline(os.stat, exe_path)
+    except TimeoutError:
+        deadlines.timed_out.append(directory)
+        raise
+    except OSError:
+        deadlines.responsive_dirs.add(directory)
+        raise
+    deadlines.responsive_dirs.add(directory)
+    return stat_result
+
+
+def probe_versions(candidates, max_workers=None, cache=None, on_entry=None, job=None):
+    """并发探测可执行文件版本
+    
+    所有探测任务提交到同一个有界线程池中执行，总耗时接近最慢的单次探测。
+    candidates可以是生成器，边生成边提交探测任务。
+    指纹与缓存一致的候选直接复用缓存，不启动子进程。
+    同一物理文件（按设备号和inode识别）的多个别名只探测一次，结果分发给所有别名。
+    每个目录的第一次stat带截止时间；位于慢目录（已隔离或本次超时）中的候选不再访问，
+    沿用缓存条目。
+    
+    Args:
+        candidates (iterable): (可执行文件名称, 可执行文件路径) 序列
+        max_workers (int): 最大并发数，默认为PROBE_MAX_WORKERS
+        cache (dict): 可执行文件路径 -> 缓存条目，或open_cache_view()的返回值
+        on_entry (callable): 每次探测完成时在工作线程中调用，接收 (可执行文件路径, 缓存条目)
+        job (ScanJob): 扫描任务，用于记录探测进度；任务取消时尚未开始的探测不再执行
+    
+    Returns:
+        dict: 可执行文件路径 -> 缓存条目（包含探测失败的负缓存条目，按候选顺序排列）
+    """
+    entries = {}
+    # 候选路径的原始顺序，结果按此顺序返回
+    order = []
+    seen = set()
+    # 物理文件标识 -> [(别名路径, 指纹)]，同一物理文件只探测一次
+    aliases = {}
+    # 物理文件标识 -> (版本号, 架构, 探测状态)，来自缓存命中的别名
+    resolved = {}
+    deadlines = DirDeadlines()
+    
+    def probe_task(exe_name, exe_path):
+        # 任务暂停时不开始新的探测，取消时直接放弃（返回None）
+        if job:
+            job.wait_if_paused()
+            if job.is_cancelled():
+                return None
+        return probe_executable(exe_name, exe_path)
+    
+    def on_probe_done(done, exe_name, exe_path, fingerprint):
+        if done.cancelled() or done.result() is None:
+            if job:
+                job.probe_cancelled()
+            return
+        # 先记录结果再从任务前沿中移除，检查点不会漏掉尚未记录的候选
+        if on_entry:
+            on_entry(exe_path, make_entry(exe_name, fingerprint, *done.result()))
+        if job:
+            job.probe_finished(exe_path)
+    
+    with ThreadPoolExecutor(max_workers=max_workers or PROBE_MAX_WORKERS) as executor:
+        futures = []
+        for exe_name, exe_path in candidates:
+            if exe_path in seen:
+                continue
+            seen.add(exe_path)
+            try:
+                stat_result = stat_candidate(exe_path, deadlines)
+            except TimeoutError:
+                # 慢目录中的候选沿用缓存条目，不从缓存中移除
+                entry = cache.get(exe_path) if cache else None
+                if entry:
+                    order.append(exe_path)
+                    entries[exe_path] = entry
+                if job:
+                    job.candidate_done(exe_path)
+                continue
+            except OSError:
+                if job:
+                    job.candidate_done(exe_path)
+                continue
+            order.append(exe_path)
+            fingerprint = stat_fingerprint(stat_result)
+            file_id = get_file_id(exe_name, exe_path, stat_result)
+            
+            entry = lookup_cache(cache, exe_name, exe_path, fingerprint)
+            if entry:
+                entries[exe_path] = entry
+                resolved.setdefault(file_id, (entry['version'], entry.get('arch'), entry.get('status', PROBE_OK)))
+                if job:
+                    job.candidate_done(exe_path)
+                continue
+            if file_id in resolved:
+                entries[exe_path] = make_entry(exe_name, fingerprint, *resolved[file_id])
+                if job:
+                    job.candidate_done(exe_path)
+                continue
+            if file_id in aliases:
+                aliases[file_id].append((exe_path, fingerprint))
+                continue
+            
+            aliases[file_id] = [(exe_path, fingerprint)]
+            if job:
+                job.probe_submitted()
+            future = executor.submit(probe_task, exe_name, exe_path)
+            if on_entry or job:
+                future.add_done_callback(
+                    lambda done, exe_name=exe_name, exe_path=exe_path, fingerprint=fingerprint:
+                        on_probe_done(done, exe_name, exe_path, fingerprint)
+                )
+            futures.append((exe_name, file_id, future))
+        
+        # 探测结果分发给同一物理文件的所有别名
+        for exe_name, file_id, future in futures:
+            # 任务已取消：尚未开始的探测不再执行，对应的候选留在检查点中
+            if job and job.is_cancelled():
+                future.cancel()
+            if future.cancelled() or future.result() is None:
+                continue
+            version, arch, status = future.result()
+            for alias_path, fingerprint in aliases[file_id]:
+                entries[alias_path] = make_entry(exe_name, fingerprint, version, arch, status)
+                if job:
+                    job.candidate_done(alias_path)
+    
+    update_quarantine(deadlines.timed_out)
+    return {path: entries[path] for path in order if path in entries}
+
+
+def scan_tool_versions(exe_name):
+    """扫描PATH中单个软件的版本
+    
+    Args:
+        exe_name (str): 可执行文件名称
+    
+    Returns:
+        dict: 软件名称 -> {版本号 -> 安装路径}
+    """
+    software = EXECUTABLES[exe_name]
+    versions = {}
+    
+    try:
+        candidates = [(exe_name, path) for path in find_executable(exe_name)]
+        entries = probe_versions(candidates, cache=load_cache(exe_name))
+        versions = build_results(entries).get(software, {})
+    except:
+        pass
+    
+    return {software: versions}
+
+
+def scan_python_versions():
+    """扫描Python版本"""
+    return scan_tool_versions("python")
+
+
+def scan_node_versions():
+    """扫描Node.js版本"""
+    return scan_tool_versions("node")
+
+
+def scan_java_versions():
+    """扫描Java版本"""
+    return scan_tool_versions("java")
+
+
+def scan_git_versions():
+    """扫描Git版本"""
+    return scan_tool_versions("git")
+
+
+def get_all_drives():
+    """获取全盘扫描的起始目录
+    
+    Windows下为本地驱动器，其他系统为挂载表中需要扫描的挂载点
+    （伪文件系统和网络文件系统除外），只遍历一个文件系统时为根目录。
+    """
+    if FULL_SCAN_ONE_FILESYSTEM and os.name != 'nt':
+        return ['/']
+    return get_scan_mounts(FULL_SCAN_INCLUDE_NETWORK)[0]
+
+
+def begin_full_scan():
+    """登记本进程中的全盘扫描
+    
+    Returns:
+        bool: 成功登记时返回True，已有全盘扫描在进行时返回False
+    """
+    global full_scan_running
+    
+    with full_scan_condition:
+        if full_scan_running:
+            return False
+        full_scan_running = True
+        return True
+
+
+def end_full_scan(results):
+    """结束本进程中的全盘扫描，并唤醒等待结果的调用者
+    
+    Args:
+        results (dict): 软件名称 -> {版本号 -> 安装路径}
+    """
+    global full_scan_running, full_scan_results
+    
+    with full_scan_condition:
+        full_scan_results = results
+        full_scan_running = False
+        full_scan_condition.notify_all()
+
+
+def get_full_scan_job():
+    """获取最近一次全盘扫描任务，可用于查看进度、暂停、继续和取消
+    
+    Returns:
+        ScanJob: 扫描任务，尚未进行过全盘扫描时返回None
+    """
+    return full_scan_job
+
+
+def wait_full_scan(timeout=None):
+    """等待本进程中正在进行的全盘扫描结束
+    
+    Args:
+        timeout (float): 最长等待时间（秒），为None时一直等待
+    
+    Returns:
+        dict: 最近一次全盘扫描的结果
+    """
+    with full_scan_condition:
+        full_scan_condition.wait_for(lambda: not full_scan_running, timeout)
+        return full_scan_results
+
+
+def acquire_full_scan_lock():
+    """获取跨进程全盘扫描锁
+    
+    其他进程正在全盘扫描时等待其结束。
+    
+    Returns:
+        tuple: (锁, 其他进程在等待期间完成的全盘扫描结果，没有时为None)
+    """
+    last_full_scan = read_cache_meta().get('full_scan_timestamp', 0)
+    scan_lock = FileLock(FULL_SCAN_LOCK_FILE)
+    scan_lock.acquire()
+    if read_cache_meta().get('full_scan_timestamp', 0) > last_full_scan:
+        return scan_lock, build_results(load_cache())
+    return scan_lock, None
+
+
+def full_scan(time_budget=None, on_entry=None, max_workers=None):
+    """全盘扫描软件
+    
+    同一时间只进行一次全盘扫描：本进程中已有扫描在进行时等待并返回它的结果；
+    其他进程持有锁文件时等待其结束，并直接使用它写入缓存的结果。
+    
+    Args:
+        time_budget (float): 时间预算（秒），默认为FULL_SCAN_TIME_BUDGET
+        on_entry (callable): 见scan_disks()
+        max_workers (int): 最大并发数，默认为PROBE_MAX_WORKERS
+    
+    Returns:
+        dict: 软件名称 -> {版本号 -> 安装路径}
+    """
+    global full_scan_job
+    
+    if not begin_full_scan():
+        return wait_full_scan()
+    
+    job = ScanJob(save_scan_checkpoint)
+    full_scan_job = job
+    job.start()
+    
+    results = {}
+    scan_lock = None
+    try:
+        scan_lock, results = acquire_full_scan_lock()
+        if results is None:
+            results = scan_disks(job, time_budget, on_entry, max_workers)
+    except:
+        results = {}
+    finally:
+        if scan_lock:
+            scan_lock.release()
+        job.finish()
+        end_full_scan(results)
+    return results
+
+
+def scan_disks(job=None, time_budget=None, on_entry=None, max_workers=None):
+    """遍历所有驱动器并探测找到的可执行文件，结果合并到缓存
+    
+    系统的locate数据库可用时直接探测其中文件名匹配的路径，不遍历磁盘（见modules/locate_db.py）；
+    否则按优先级遍历目录，最可能包含运行时的目录先遍历（见modules/dir_priority.py）。
+    存在上次中断留下的检查点时，从检查点中的遍历前沿继续，而不是从根目录重新开始。
+    任务被取消或时间预算用完时保存检查点，已得到的结果合并到缓存，全盘扫描保持未完成状态。
+    
+    Args:
+        job (ScanJob): 扫描任务
+        time_budget (float): 时间预算（秒），默认为FULL_SCAN_TIME_BUDGET
+        on_entry (callable): 每次探测完成时在工作线程中调用，接收 (可执行文件路径, 缓存条目)
+        max_workers (int): 最大并发数，默认为PROBE_MAX_WORKERS
+    
+    Returns:
+        dict: 软件名称 -> {版本号 -> 安装路径}
+    """
+    job = job or ScanJob(save_scan_checkpoint)
+    mark_full_scan_started()
+    scan_started = time.time()
+    
+    if time_budget is None:
+        time_budget = FULL_SCAN_TIME_BUDGET
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    
+    # 只重新列出mtime变化的目录，未变化且没有候选文件的子树直接跳过
+    previous_index = load_dir_index()
+    index = {}
+    
+    checkpoint = load_scan_checkpoint()
+    locate_candidates = None
+    if checkpoint:
+        roots = checkpoint.get('frontier', [])
+        resumed_candidates = checkpoint.get('candidates', [])
+    else:
+        # 获取所有驱动器
+        roots = get_all_drives()
+        resumed_candidates = []
+        # locate数据库可用时直接使用其中的路径，不遍历磁盘
+        locate_candidates = get_locate_db_candidates()
+    
+    def iter_candidates():
+        # 检查点中尚未得到探测结果的候选优先
+        for exe_name, exe_path in resumed_candidates:
+            if exe_name in EXECUTABLES:
+                job.file_matched(exe_name, exe_path)
+                yield exe_name, exe_path
+        if locate_candidates is not None:
+            for exe_name, exe_path in locate_candidates:
+                job.file_matched(exe_name, exe_path)
+                yield exe_name, exe_path
+            return
+        yield from iter_disk_candidates(roots, previous_index, index, job, deadline)
+    
+    # 本次扫描的探测结果共用一个写入连接
+    journal_writer = open_journal_writer()
+    
+    def record_entry(exe_path, entry):
+        append_journal(exe_path, entry, journal_writer)
+        if on_entry:
+            on_entry(exe_path, entry)
+    
+    # 边遍历边提交探测任务，指纹未变化的直接复用缓存（包括上次中断前写入日志的结果），
+    # 每个探测结果立即追加到扫描日志
+    cache = open_cache_view()
+    try:
+        scan_entries = probe_versions(
+            iter_candidates(), max_workers, cache=cache, on_entry=record_entry, job=job
+        )
+    finally:
+        close_cache_view(cache)
+        if journal_writer:
+            journal_writer.close()
+    
+    # 时间预算用完时仍有未遍历的目录，与取消一样留到下次继续
+    out_of_time = deadline is not None and job.get_progress()['frontier'] > 0
+    if job.is_cancelled() or out_of_time:
+        job.save_checkpoint()
+        merge_cache(scan_entries)
+        return build_results(scan_entries)
+    
+    results = build_results(scan_entries)
+    
+    # 贫瘠目录统计只根据本次实际遍历到的目录更新，检查点中没有遍历前沿
+    # （如locate数据库扫描中断后继续）时什么也没有遍历，统计保持不变
+    if checkpoint:
+        if index:
+            # 中断前已遍历的目录不在本次索引中，沿用上次的索引条目并重新计算子树命中标记
+            resumed_index = dict(previous_index)
+            resumed_index.update(index)
+            mark_subtree_hits(resumed_index)
+            # 没有可用的旧索引时以本次扫描的开始时间作为索引时间，否则下次加载时视为已过期
+            save_dir_index(resumed_index, None if previous_index else scan_started)
+            save_dir_stats(index, partial=True)
+        # 结果包括中断前已写入扫描日志的条目
+        results = build_results({**load_cache(), **scan_entries})
+    elif locate_candidates is None:
+        # 保存目录索引，没有可用的旧索引时记录为完整遍历
+        # （使用locate数据库时没有遍历磁盘，目录索引和贫瘠目录统计保持不变）
+        save_dir_index(index, None if previous_index else scan_started)
+        if index:
+            # 被看门狗放弃的慢目录没有遍历，其子树的统计保持不变
+            save_dir_stats(index, partial=bool(job.slow_dirs))
+    clear_scan_checkpoint()
+    
+    # 更新缓存，同时将扫描日志压缩进快照
+    merge_cache(scan_entries, time.time())
+    
+    return results
+
+
+def should_skip_dir(name):
+    """检查全盘扫描时是否跳过该目录（系统目录和隐藏目录，IDE和版本管理器的安装目录除外）"""
+    if name in HIDDEN_INSTALL_DIRS:
+        return False
+    return name.startswith('.') or name in SKIP_DIRS
+
+
+def is_path_filtered(path, skip_dir):
+    """检查路径是否位于全盘扫描会跳过的目录中
+    
+    Args:
+        path (str): 文件路径
+        skip_dir (callable): make_dir_filter()的返回值
+    
+    Returns:
+        bool: 任一上级目录被跳过时返回True
+    """
+    directory = os.path.dirname(path)
+    while True:
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return False
+        if skip_dir(directory, os.path.basename(directory)):
+            return True
+        directory = parent
+
+
+def get_locate_db_candidates():
+    """从系统的locate数据库中获取全盘扫描的候选可执行文件
+    
+    与目录遍历使用相同的过滤规则（跳过目录、包含/排除规则和慢目录）。
+    
+    Returns:
+        list: (可执行文件名称, 可执行文件路径) 列表，没有可用的数据库时返回None
+    """
+    if not FULL_SCAN_USE_LOCATE:
+        return None
+    candidates = get_locate_candidates(EXECUTABLE_FILE_NAMES)
+    if candidates is None:
+        return None
+    skip_dir = make_dir_filter()
+    quarantine = load_quarantine()
+    return [
+        (exe_name, path) for exe_name, path in candidates
+        if not is_path_filtered(path, skip_dir) and not is_quarantined(quarantine, path)
+    ]
+
+
+def make_dir_filter(dir_stats=None):
+    """生成全盘扫描的目录过滤函数
+    
+    包含规则优先；其次是固定的跳过目录、排除规则和学习得到的贫瘠子树。
+    
+    Args:
+        dir_stats (dict): load_dir_stats()的返回值
+    
+    Returns:
+        callable: 接收 (目录路径, 目录名)，返回True时跳过该目录
+    """
+    dir_stats = dir_stats or {}
+    
+    def skip_dir(path, name):
+        if match_rules(SCAN_INCLUDE_RULES, path, name):
+            return False
+        if should_skip_dir(name) or match_rules(SCAN_EXCLUDE_RULES, path, name):
+            return True
+        return is_barren_skipped(dir_stats, path)
+    
+    return skip_dir
+
+
+def iter_disk_candidates(drives, previous_index=None, index=None, job=None, deadline=None):
+    """按优先级遍历驱动器，逐个产出候选可执行文件
+    
+    目录名提示词、上次扫描的子树命中和缓存中已知的安装路径决定遍历顺序，
+    最可能包含运行时的目录先遍历。
+    
+    Args:
+        drives (list): 驱动器根目录（或检查点中的遍历前沿）列表
+        previous_index (dict): 上次全盘扫描保存的目录索引，用于增量遍历
+        index (dict): 用于记录本次遍历的目录索引
+        job (ScanJob): 扫描任务
+        deadline (float): 遍历截止时间（time.monotonic()），为None时不限制
+    
+    Yields:
+        tuple: (可执行文件名称, 可执行文件路径)
+    """
+    quarantine = load_quarantine()
+    # 失效的驱动器在检查是否存在时就可能阻塞，同样带截止时间
+    roots = []
+    timed_out = []
+    drives = [drive for drive in drives if not is_quarantined(quarantine, drive)]
+    for drive, exists, error in map_with_deadline(os.path.exists, drives):
+        if isinstance(error, TimeoutError):
+            timed_out.append(drive)
+        elif exists:
+            roots.append(drive)
+    
+    # 伪文件系统和网络文件系统的挂载点、隔离期内的慢目录整棵跳过
+    _, pruned_mounts = get_scan_mounts(FULL_SCAN_INCLUDE_NETWORK)
+    pruned_mounts.update(get_quarantined_dirs(quarantine))
+    known_paths = [path for _, _, path, _ in get_installations()]
+    priority = make_priority(get_hit_dirs(previous_index, known_paths))
+    try:
+        yield from parallel_walk(
+            roots, EXECUTABLE_FILE_NAMES, make_dir_filter(load_dir_stats()),
+            previous_index=previous_index, index=index, job=job,
+            prune_paths=pruned_mounts, one_filesystem=FULL_SCAN_ONE_FILESYSTEM,
+            dir_timeout=DIR_TIMEOUT, timed_out=timed_out,
+            priority=priority, deadline=deadline
+        )
+    finally:
+        update_quarantine(timed_out)
+
+
+def get_probe_command(exe_name, exe_path):
+    """获取版本探测命令
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+    
+    Returns:
+        list: 命令行参数列表
+    """
+    return [exe_path, *TOOL_SPECS[exe_name].probe_args]
+
+
+def parse_version_output(exe_name, stdout, stderr):
+    """从探测命令的输出中解析版本号
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        stdout (str): 标准输出
+        stderr (str): 标准错误
+    
+    Returns:
+        str: 版本号或None
+    """
+    return TOOL_SPECS[exe_name].parse_output(stdout, stderr)
+
+
+def read_static_version(exe_name, exe_path, header=None):
+    """不启动子进程读取版本号
+    
+    优先使用安装元数据，其次使用PE文件的VERSIONINFO资源。VERSIONINFO不属于该软件本身时
+    （启动器、shim）不使用，交给探测子进程。
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+        header (dict): read_exe_header()的返回值
+    
+    Returns:
+        str: 版本号或None
+    """
+    spec = TOOL_SPECS[exe_name]
+    for reader in spec.metadata_readers:
+        try:
+            version = reader(exe_path)
+        except:
+            version = None
+        if version:
+            return version
+    if spec.header_reader and header_matches_tool(header, exe_name, spec.header_products):
+        return spec.header_reader(header)
+    return None
+
+
+def run_version_probe(exe_name, exe_path):
+    """运行可执行文件获取版本信息
+    
+    探测进程有截止时间和资源上限，超时后结束整个进程树。
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+    
+    Returns:
+        tuple: (版本号或None, 探测状态)
+    """
+    try:
+        returncode, stdout, stderr, timed_out = run_probe(get_probe_command(exe_name, exe_path))
+        if timed_out:
+            return None, PROBE_TIMEOUT
+        if returncode == 0:
+            version = parse_version_output(exe_name, stdout, stderr)
+            if version:
+                return version, PROBE_OK
+    except:
+        pass
+    return None, PROBE_FAILED
+
+
+def inspect_executable(exe_name, exe_path):
+    """不启动子进程检查可执行文件
+    
+    先从安装元数据和文件头中读取版本号，读取不到时再用文件头和执行权限
+    排除明显无法运行的文件。同步和异步探测共用这一步骤。
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+    
+    Returns:
+        tuple: (版本号或None, 架构或None, 探测状态)，需要启动子进程探测时状态为None
+    """
+    header = read_exe_header(exe_path)
+    arch = header.get('arch') if header else None
+    
+    version = read_static_version(exe_name, exe_path, header)
+    if version:
+        return version, arch, PROBE_OK
+    if preflight_check(exe_path, header):
+        return None, arch, PROBE_REJECTED
+    return None, arch, None
+
+
+def probe_executable(exe_name, exe_path):
+    """获取可执行文件的版本号和架构
+    
+    只在inspect_executable()无法得出结果时才启动子进程。
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+    
+    Returns:
+        tuple: (版本号或None, 架构或None, 探测状态)
+    """
+    version, arch, status = inspect_executable(exe_name, exe_path)
+    if status is not None:
+        return version, arch, status
+    version, status = run_version_probe(exe_name, exe_path)
+    return version, arch, status
+
+
+def get_version_info(exe_name, exe_path):
+    """获取可执行文件版本信息
+    
+    Args:
+        exe_name (str): 可执行文件名称
+        exe_path (str): 可执行文件路径
+    
+    Returns:
+        str: 版本号或None
+    """
+    return probe_executable(exe_name, exe_path)[0]
+
+
+def start_full_scan():
+    """启动异步全盘扫描
+    
+    Returns:
+        bool: 是否启动了新的扫描线程，已有全盘扫描在进行时返回False
+    """
+    with full_scan_condition:
+        if full_scan_running:
+            return False
+    scan_thread = threading.Thread(target=full_scan)
+    scan_thread.daemon = True
+    scan_thread.start()
+    return True
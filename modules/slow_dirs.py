@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""慢目录检测模块
+
+失效的映射驱动器或网络共享上的stat和scandir调用可能阻塞数十秒，而且无法中断。
+这里把这类调用放到守护线程中执行并设置截止时间，超时的目录记入隔离表，
+在退避时间内不再访问；同一目录连续超时时退避时间加倍。
+"""
+
+import os
+import threading
+import time
+
+
+# 单个目录的stat/scandir截止时间（秒）
+DIR_TIMEOUT = 2.0
+
+# 首次隔离的时间（秒），连续超时时加倍
+QUARANTINE_BASE = 300
+# 最长隔离时间（秒）
+QUARANTINE_MAX = 24 * 3600
+
+
+def map_with_deadline(func, items, timeout=None):
+    """对每一项并行调用func，所有调用共用一个截止时间
+
+    每一项在单独的守护线程中执行，超时的调用留在后台直到系统调用返回，
+    不会阻塞调用方和进程退出。
+
+    Args:
+        func (callable): 接收一项，返回结果
+        items (iterable): 参数列表
+        timeout (float): 截止时间（秒），默认为DIR_TIMEOUT
+
+    Returns:
+        list: (项, 结果, 异常) 列表，按items顺序排列；超时的项异常为TimeoutError
+    """
+    timeout = DIR_TIMEOUT if timeout is None else timeout
+    calls = []
+    for item in items:
+        outcome = {}
+
+        def target(item=item, outcome=outcome):
+            try:
+                outcome['result'] = func(item)
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        calls.append((item, thread, outcome))
+
+    deadline = time.monotonic() + timeout
+    results = []
+    for item, thread, outcome in calls:
+        thread.join(max(0, deadline - time.monotonic()))
+        if thread.is_alive():
+            results.append((item, None, TimeoutError(f"{item} 在 {timeout} 秒内没有响应")))
+        else:
+            results.append((item, outcome.get('result'), outcome.get('error')))
+    return results
+
+
+def run_with_deadline(func, item, timeout=None):
+    """带截止时间调用func(item)
+
+    Raises:
+        TimeoutError: 超过截止时间
+    """
+    _, result, error = map_with_deadline(func, [item], timeout)[0]
+    if error is not None:
+        raise error
+    return result
+
+
+def _quarantine_key(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+def is_quarantined(quarantine, path, now=None):
+    """检查路径（或其上级目录）是否在隔离期内
+
+    Args:
+        quarantine (dict): 隔离表：规范化的目录 -> {path, until, failures}
+        path (str): 目录或文件路径
+        now (float): 当前时间
+
+    Returns:
+        bool: 在隔离期内时返回True
+    """
+    if not quarantine:
+        return False
+    now = time.time() if now is None else now
+    key = _quarantine_key(path)
+    while True:
+        record = quarantine.get(key)
+        if record and record.get('until', 0) > now:
+            return True
+        parent = os.path.dirname(key)
+        if parent == key:
+            return False
+        key = parent
+
+
+def get_quarantined_dirs(quarantine, now=None):
+    """获取隔离期内的目录列表"""
+    now = time.time() if now is None else now
+    return sorted(
+        record.get('path', key) for key, record in quarantine.items() if record.get('until', 0) > now
+    )
+
+
+def quarantine_dirs(quarantine, directories, now=None):
+    """将超时的目录记入隔离表，连续超时时退避时间加倍
+
+    Args:
+        quarantine (dict): 隔离表，原地更新
+        directories (iterable): 超时的目录
+        now (float): 当前时间
+    """
+    now = time.time() if now is None else now
+    for directory in directories:
+        key = _quarantine_key(directory)
+        failures = quarantine.get(key, {}).get('failures', 0) + 1
+        backoff = min(QUARANTINE_BASE * 2 ** (failures - 1), QUARANTINE_MAX)
+        quarantine[key] = {'path': directory, 'until': now + backoff, 'failures': failures}
+
+
+def release_dirs(quarantine, directories):
+    """将已恢复响应的目录移出隔离表
+
+    Args:
+        quarantine (dict): 隔离表，原地更新
+        directories (iterable): 已恢复响应的目录
+
+    Returns:
+        bool: 隔离表是否有变化
+    """
+    changed = False
+    for directory in directories:
+        if quarantine.pop(_quarantine_key(directory), None) is not None:
+            changed = True
+    return changed
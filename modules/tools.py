@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""软件目录模块
+
+每个支持的软件由一条ToolSpec描述：可执行文件名称、探测参数、读取哪个输出流、
+预编译的版本号正则，以及无需启动子进程的元数据读取函数。
+扫描器只依赖这里的描述，新增软件只需增加一条记录。
+"""
+
+import re
+
+from modules.exe_header import header_java_version, header_product_version
+from modules.metadata import (
+    read_git_version,
+    read_go_version,
+    read_gradle_version,
+    read_java_version,
+    read_maven_version,
+    read_node_version,
+    read_python_version,
+)
+
+
+class ToolSpec:
+    """软件描述"""
+    def __init__(self, exe_name, software, category, probe_args, stream, pattern,
+                 metadata_readers=(), header_reader=None, header_products=()):
+        # 可执行文件名称（不含扩展名）
+        self.exe_name = exe_name
+        # 显示名称
+        self.software = software
+        # 导航分类
+        self.category = category
+        # 版本探测参数
+        self.probe_args = list(probe_args)
+        # 版本号所在的输出流：stdout、stderr或both
+        self.stream = stream
+        # 版本号正则，第一个分组为版本号
+        self.pattern = re.compile(pattern)
+        # 安装元数据读取函数，接收可执行文件路径，返回版本号或None
+        self.metadata_readers = tuple(metadata_readers)
+        # PE文件头版本读取函数，接收read_exe_header()的返回值
+        self.header_reader = header_reader
+        # VERSIONINFO中ProductName/CompanyName的提示词（小写），不匹配时不使用文件头版本
+        self.header_products = tuple(header_products)
+
+    def parse_output(self, stdout, stderr):
+        """从探测命令的输出中解析版本号"""
+        if self.stream == 'stdout':
+            text = stdout
+        elif self.stream == 'stderr':
+            text = stderr
+        else:
+            text = f"{stdout}\n{stderr}"
+        match = self.pattern.search(text or '')
+        if match:
+            return match.group(1)
+        return None
+
+
+# 软件目录
+TOOLS = [
+    # Python 3.4起版本信息输出到stdout，更早的版本输出到stderr
+    ToolSpec("python", "Python", "Languages", ["--version"], "both",
+             r"Python (\d+\.\d+\.\d+)",
+             [read_python_version], header_product_version, ['python']),
+    ToolSpec("node", "Node.js", "Languages", ["--version"], "stdout",
+             r"v?(\d+\.\d+\.\d+\S*)",
+             [read_node_version], header_product_version, ['node.js']),
+    ToolSpec("java", "Java", "Languages", ["-version"], "stderr",
+             r'version "(\d+\.\d+\.\d+.*?)"',
+             [read_java_version], header_java_version,
+             ['java', 'openjdk', 'jdk', 'zulu', 'graalvm']),
+    ToolSpec("git", "Git", "Languages", ["--version"], "stdout",
+             r"git version (\d+\.\d+\.\d+)",
+             [read_git_version], header_product_version, ['git']),
+    ToolSpec("go", "Go", "Languages", ["version"], "stdout",
+             r"go version go(\d+\.\d+(?:\.\d+)?)",
+             [read_go_version]),
+    ToolSpec("rustc", "Rust", "Languages", ["--version"], "stdout",
+             r"rustc (\d+\.\d+\.\d+)"),
+    ToolSpec("ruby", "Ruby", "Languages", ["--version"], "stdout",
+             r"ruby (\d+\.\d+\.\d+)"),
+    ToolSpec("dotnet", ".NET", "Languages", ["--version"], "stdout",
+             r"(\d+\.\d+\.\d+\S*)"),
+    ToolSpec("mvn", "Maven", "Build Tools", ["--version"], "stdout",
+             r"Apache Maven (\d+\.\d+\.\d+)",
+             [read_maven_version]),
+    ToolSpec("gradle", "Gradle", "Build Tools", ["--version"], "stdout",
+             r"Gradle (\d+\.\d+(?:\.\d+)?)",
+             [read_gradle_version]),
+]
+
+# 可执行文件名称 -> 软件描述
+TOOL_SPECS = {spec.exe_name: spec for spec in TOOLS}
+
+
+def get_nav_items():
+    """按分类获取导航项
+
+    Returns:
+        dict: 分类 -> 软件显示名称列表
+    """
+    nav_items = {}
+    for spec in TOOLS:
+        nav_items.setdefault(spec.category, []).append(spec.software)
+    return nav_items
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""并行目录遍历模块
+
+基于os.scandir实现：多个工作线程从共享的优先级队列中取出目录并列出内容，
+给出优先级函数时按优先级遍历（最可能包含目标文件的目录先遍历），否则按入队顺序逐层遍历；
+直接使用DirEntry自带的类型信息判断目录，文件名用一次集合查找完成匹配，
+只有命中的文件才会额外确认是否为普通文件。
+每个目录按 (st_dev, st_ino) 只遍历一次，绑定挂载和符号链接环不会被重复遍历。
+设置目录截止时间时，看门狗线程放弃卡在单个目录上超时的工作线程并补充新的工作线程，
+失效的网络共享不会拖住整个遍历。
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+
+
+# 目录遍历的工作线程数
+WALK_MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# 结束标记
+_DONE = object()
+
+
+def _copy_subtree(previous_index, index, directory):
+    """将未变化的子树从上次的目录索引原样复制到本次索引"""
+    stack = [directory]
+    while stack:
+        path = stack.pop()
+        entry = previous_index.get(path)
+        if entry is None:
+            continue
+        index[path] = entry
+        stack.extend(os.path.join(path, name) for name in entry[2])
+
+
+def mark_subtree_hits(index):
+    """根据各目录自身的匹配结果计算子树命中标记
+
+    子目录路径总是比父目录长，按路径长度从长到短处理即可保证先子后父。
+    """
+    for path in sorted(index, key=len, reverse=True):
+        entry = index[path]
+        if entry[1] or entry[3]:
+            entry[1] = True
+            parent = os.path.dirname(path)
+            if parent != path and parent in index:
+                index[parent][1] = True
+
+
+def parallel_walk(roots, file_names, skip_dir=None, max_workers=None,
+                  previous_index=None, index=None, job=None,
+                  prune_paths=None, one_filesystem=False, dir_timeout=None, timed_out=None,
+                  priority=None, deadline=None):
+    """并行遍历目录，产出文件名匹配的文件
+
+    传入index时记录本次遍历的目录索引：目录路径 -> [mtime, 子树是否命中,
+    子目录名列表, [[匹配键, 文件名], ...]]。同时传入previous_index时进行增量遍历：
+    mtime未变化的目录直接复用上次的列表结果，未变化且子树中没有匹配文件的目录整棵跳过。
+
+    Args:
+        roots (list): 起始目录列表
+        file_names (dict): 文件名 -> 匹配键（如 "python.exe" -> "python"），
+            Windows下文件名按小写比较
+        skip_dir (callable): 接收 (目录路径, 目录名)，返回True时跳过该目录（起始目录不受影响）
+        max_workers (int): 工作线程数，默认为WALK_MAX_WORKERS
+        previous_index (dict): 上次遍历保存的目录索引
+        index (dict): 用于记录本次遍历的目录索引，为None时不记录
+        job (ScanJob): 扫描任务，用于记录进度和遍历前沿、响应暂停和取消
+        prune_paths (set): 整棵跳过的目录路径（如伪文件系统和网络文件系统的挂载点）
+        one_filesystem (bool): 为True时不进入与起始目录不在同一文件系统（st_dev不同）的目录
+        dir_timeout (float): 单个目录stat/scandir的截止时间（秒），为None时不限制。
+            每读到一个目录项截止时间顺延，很大但持续有响应的目录不会超时
+        timed_out (list): 用于记录超时的目录（一个目录项都没有读到的目录）
+        priority (callable): 接收 (目录路径, 上级目录的优先级)，返回目录的优先级，
+            数值越小越先遍历；为None时按入队顺序遍历
+        deadline (float): 遍历截止时间（time.monotonic()），到期后不再开始新的目录，
+            未遍历的目录与取消时一样留在遍历前沿中
+
+    Yields:
+        tuple: (匹配键, 文件路径)
+    """
+    fold_case = os.name == 'nt'
+    max_workers = max_workers or WALK_MAX_WORKERS
+    previous_index = previous_index or {}
+    # (优先级, 入队序号, 目录)，同优先级的目录按入队顺序取出
+    dir_queue = queue.PriorityQueue()
+    sequence = itertools.count()
+    out_queue = queue.Queue()
+    stop_event = threading.Event()
+    prune_paths = prune_paths or set()
+    # 已访问目录的 (st_dev, st_ino)
+    visited = set()
+    visited_lock = threading.Lock()
+    # 起始目录所在的文件系统
+    root_devices = None
+    if one_filesystem:
+        root_devices = set()
+        for root in roots:
+            try:
+                root_devices.add(os.stat(root).st_dev)
+            except OSError:
+                pass
+
+    def visit(directory, stat_result):
+        """登记已访问目录，已访问过时返回False"""
+        # 文件系统不提供inode（st_ino为0）时退化为按路径去重，否则所有目录都被视为已访问
+        if stat_result.st_ino:
+            key = (stat_result.st_dev, stat_result.st_ino)
+        else:
+            key = os.path.normcase(os.path.abspath(directory))
+        with visited_lock:
+            if key in visited:
+                return False
+            visited.add(key)
+            return True
+
+    def enqueue(directory, score=0):
+        if job:
+            job.dir_queued(directory)
+        dir_queue.put((score, next(sequence), directory))
+
+    def list_directory(directory, activity):
+        """列出目录中的子目录和匹配文件，每读到一个目录项在activity中记录响应时间"""
+        subdirs = []
+        matches = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                activity[1] = time.monotonic()
+                activity[2] = True
+                name = entry.name
+                # 目录类型来自DirEntry缓存，不产生额外的stat调用
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(name)
+                    continue
+                key = file_names.get(name.lower() if fold_case else name)
+                if key and entry.is_file():
+                    matches.append([key, name])
+        return subdirs, matches
+
+    # 工作线程标识 -> [正在读取的目录, 最近一次响应的时间, 是否已读到目录项]
+    busy = {}
+    busy_lock = threading.Lock()
+    walk_done = threading.Event()
+
+    def read_directory(directory, activity):
+        """读取目录（可能阻塞的部分）
+
+        Returns:
+            tuple: (mtime, 子目录名列表, 匹配文件列表, 是否整棵跳过)，
+                已访问过或不在同一文件系统时返回None
+        """
+        # 每个目录一次stat：去重、文件系统判断和增量遍历共用
+        stat_result = os.stat(directory)
+        if (root_devices is not None and stat_result.st_dev not in root_devices) \
+                or not visit(directory, stat_result):
+            return None
+        mtime = stat_result.st_mtime_ns
+        previous = previous_index.get(directory)
+        if previous and previous[0] == mtime:
+            # 目录未变化且上次子树中没有匹配文件时整棵跳过
+            return mtime, previous[2], previous[3], not previous[1]
+        subdirs, matches = list_directory(directory, activity)
+        return mtime, subdirs, matches, False
+
+    def process(token, directory, score):
+        """处理一个目录，已被看门狗放弃时返回False"""
+        if job:
+            job.wait_if_paused()
+        # 取消或到期时未处理的目录留在遍历前沿中
+        if stop_event.is_set() or (job and job.is_cancelled()) \
+                or (deadline is not None and time.monotonic() >= deadline):
+            return True
+
+        activity = [directory, time.monotonic(), False]
+        with busy_lock:
+            busy[token] = activity
+        try:
+            result = read_directory(directory, activity)
+        except OSError:
+            result = None
+        with busy_lock:
+            if busy.pop(token, None) is None:
+                return False
+
+        if result is None:
+            if job:
+                job.dir_done(directory)
+            return True
+        mtime, subdirs, matches, unchanged = result
+        if unchanged:
+            _copy_subtree(previous_index, index, directory)
+            if job:
+                job.dir_done(directory)
+            return True
+
+        if index is not None:
+            index[directory] = [mtime, False, subdirs, matches]
+        for name in subdirs:
+            path = os.path.join(directory, name)
+            if path not in prune_paths and not (skip_dir and skip_dir(path, name)):
+                enqueue(path, priority(path, score) if priority else 0)
+        for key, name in matches:
+            path = os.path.join(directory, name)
+            if job:
+                job.file_matched(key, path)
+            out_queue.put((key, path))
+        if job:
+            job.dir_done(directory)
+        return True
+
+    def worker():
+        token = object()
+        while True:
+            score, _, directory = dir_queue.get()
+            if directory is None:
+                dir_queue.task_done()
+                return
+            if not process(token, directory, score):
+                # 看门狗已替本线程调用task_done并补充了工作线程
+                return
+            dir_queue.task_done()
+
+    def start_worker():
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    def watchdog():
+        # 放弃超过截止时间没有任何响应的工作线程
+        while not walk_done.wait(min(dir_timeout, 0.5)):
+            now = time.monotonic()
+            with busy_lock:
+                overdue = [
+                    (token, directory, responded)
+                    for token, (directory, last_active, responded) in busy.items()
+                    if now - last_active >= dir_timeout
+                ]
+                for token, _, _ in overdue:
+                    del busy[token]
+            for _, directory, responded in overdue:
+                # 读到过目录项后才停顿的目录不是失效的挂载，只放弃本次遍历，不记入隔离表
+                if timed_out is not None and not responded:
+                    timed_out.append(directory)
+                if job:
+                    job.dir_timed_out(directory)
+                start_worker()
+                dir_queue.task_done()
+
+    def finisher():
+        # 所有目录处理完毕后通知消费者并结束工作线程
+        dir_queue.join()
+        walk_done.set()
+        out_queue.put(_DONE)
+        for _ in range(max_workers):
+            dir_queue.put((float('inf'), next(sequence), None))
+
+    for root in roots:
+        enqueue(root)
+
+    for _ in range(max_workers):
+        start_worker()
+    threads = [threading.Thread(target=finisher)]
+    if dir_timeout:
+        threads.append(threading.Thread(target=watchdog))
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        while True:
+            item = out_queue.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # 消费者提前退出时，让工作线程尽快清空队列
+        stop_event.set()
+        walk_done.set()
+
+    if index is not None:
+        mark_subtree_hits(index)